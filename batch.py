@@ -0,0 +1,89 @@
+"""
+Project: Tic-Tac-Toe
+Description: Checks many boards at once with numpy. Boards are given as an (N, 9) int8 array with 0 for an empty
+             square, 1 for x and 2 for o, square 1 being column 0. Every check is done against the 8 winning lines
+             for all the boards together instead of one Board object at a time. Only for the standard 3x3 board.
+"""
+import numpy as np
+
+from engine import WIN_MASKS
+
+EMPTY = 0
+X = 1
+O = 2
+
+# LINES holds the three squares (0 to 8) of every winning line, in the same order as WIN_MASKS.
+LINES = np.array([[square for square in range(9) if mask >> square & 1] for mask, line in WIN_MASKS])
+
+
+# to_array function turns a list of Board objects into the array the other functions take.
+def to_array(boards):
+    codes = {" ": EMPTY, "x": X, "o": O}
+    return np.array([[codes[spot] for spot in board.get_moves()] for board in boards], dtype=np.int8).reshape(-1, 9)
+
+
+# line_counts function returns how many of the symbol and how many empty squares are on every line, both (N, 8).
+def line_counts(positions, symbol):
+    line_cells = positions[:, LINES]
+    return (line_cells == symbol).sum(axis=2), (line_cells == EMPTY).sum(axis=2)
+
+
+# winners function returns who has won each board, 0 if nobody, 1 if x or 2 if o.
+def winners(positions):
+    line_cells = positions[:, LINES]
+    x_won = (line_cells == X).all(axis=2).any(axis=1)
+    o_won = (line_cells == O).all(axis=2).any(axis=1)
+    return np.where(x_won, X, np.where(o_won, O, EMPTY)).astype(np.int8)
+
+
+# draws function returns True for every board that is full without anyone winning.
+def draws(positions, winner=None):
+
+    if winner is None:
+        winner = winners(positions)
+
+    return (positions != EMPTY).all(axis=1) & (winner == EMPTY)
+
+
+# legal_moves function returns an (N, 9) mask of the squares that can still be played. A finished board has none.
+def legal_moves(positions, winner=None):
+
+    if winner is None:
+        winner = winners(positions)
+
+    return (positions == EMPTY) & (winner == EMPTY)[:, None]
+
+
+# threats function returns an (N, 9) mask of every square that would win the game for the symbol if played there.
+def threats(positions, symbol):
+    symbol_count, empty_count = line_counts(positions, symbol)
+    threat_lines = (symbol_count == 2) & (empty_count == 1)
+    empty_cells = positions[:, LINES] == EMPTY
+    mask = np.zeros(positions.shape, dtype=bool)
+
+    for line in range(len(LINES)):
+        mask[:, LINES[line]] |= empty_cells[:, line, :] & threat_lines[:, line, None]
+
+    return mask
+
+
+# one_off_win function does the same as engine.one_off_win for every board, returning the square (1 to 9) on the
+# first line the symbol is one off winning, or 0 if there isn't one.
+def one_off_win(positions, symbol):
+    symbol_count, empty_count = line_counts(positions, symbol)
+    threat_lines = (symbol_count == 2) & (empty_count == 1)
+    squares = LINES[np.arange(len(LINES)), (positions[:, LINES] == EMPTY).argmax(axis=2)] + 1
+    first = threat_lines.argmax(axis=1)
+    found = threat_lines.any(axis=1)
+    return np.where(found, squares[np.arange(len(positions)), first], 0).astype(np.int8)
+
+
+# evaluate function runs every check at once and returns the arrays in a dictionary.
+def evaluate(positions):
+    positions = np.asarray(positions, dtype=np.int8).reshape(-1, 9)
+    winner = winners(positions)
+    return {"winners": winner,
+            "draws": draws(positions, winner),
+            "legal_moves": legal_moves(positions, winner),
+            "x_threats": threats(positions, X),
+            "o_threats": threats(positions, O)}
@@ -0,0 +1,310 @@
+"""
+Project: Tic-Tac-Toe
+Description: Times the parts of the game that have to be fast; making moves and checking for wins, the robot's
+             decisions over a fixed set of positions, whole headless games, and drawing the board under SDL's dummy
+             video driver. The results are written as JSON and can be compared against an older run, any benchmark
+             that got slower by more than the threshold is flagged and the program exits with an error.
+Usage: python benchmark.py [--output results.json] [--baseline old.json] [--threshold 0.25] [--only NAME ...]
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+import engine
+from engine import Board, Scoreboard
+
+# CORPUS_SEED and CORPUS_SIZE make the fixed set of positions the robot benchmarks use.
+CORPUS_SEED = 1234
+CORPUS_SIZE = 500
+
+# TARGETS are the most seconds some benchmarks should take, whatever the baseline says. Importing the engine or the
+# game must not start SDL or open a window, so tools and workers start quickly. How long a new process takes depends
+# on the computer, so a missed target is only reported, it is the baseline that fails the run.
+TARGETS = {"import_engine": 0.05, "import_game": 0.1}
+
+
+# make_corpus function plays random moves from a fixed seed and keeps positions that aren't finished, with the last
+# move played on each. Every run gets the same positions.
+def make_corpus():
+    generator = random.Random(CORPUS_SEED)
+    corpus = []
+
+    while len(corpus) < CORPUS_SIZE:
+        board = Board(Scoreboard(), verbose=False)
+        last_move = None
+
+        for _ in range(generator.randint(1, 7)):
+            symbol = board.current_symbol
+            move = generator.choice(board.possible_moves)
+            board.new_move(move, symbol)
+
+            if board.total_moves == 0:
+                break
+
+            last_move = move
+
+        if board.total_moves != 0:
+            corpus.append((board, last_move))
+
+    return corpus
+
+
+# measure function runs the function repeatedly and returns the fastest time per call out of the repeats.
+def measure(function, number, repeats=5):
+    best = None
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+
+        for _ in range(number):
+            function()
+
+        elapsed = (time.perf_counter() - start) / number
+
+        if best is None or elapsed < best:
+            best = elapsed
+
+    return best
+
+
+# bench_new_move times Board.new_move, which also checks for a win, by playing fixed games from an empty board.
+def bench_new_move(corpus):
+    generator = random.Random(CORPUS_SEED)
+    games = [generator.sample(range(1, 10), 9) for _ in range(100)]
+
+    def play():
+
+        for moves in games:
+            board = Board(Scoreboard(), verbose=False)
+
+            for move in moves:
+                board.new_move(move, board.current_symbol)
+
+                if board.total_moves == 0:
+                    break
+
+    return measure(play, 20) / sum(len(moves) for moves in games)
+
+
+# bench_undo_redo times taking back every move of fixed games with Board.undo and playing them again with Board.redo.
+def bench_undo_redo(corpus):
+    generator = random.Random(CORPUS_SEED)
+    boards = []
+
+    for _ in range(100):
+        board = Board(Scoreboard(), verbose=False)
+
+        # Stops before the last move, so redo never finishes the game and resets the board.
+        for move in generator.sample(range(1, 10), 9)[:4]:
+            board.new_move(move, board.current_symbol)
+
+        boards.append(board)
+
+    def undo_redo():
+
+        for board in boards:
+
+            while board.undo():
+                pass
+
+            while board.redo():
+                pass
+
+    return measure(undo_redo, 20) / (len(boards) * 8)
+
+
+# bench_check_win times Board.check_win on positions nobody has won yet, so the board is never reset.
+def bench_check_win(corpus):
+
+    def check():
+
+        for board, last_move in corpus:
+            board.check_win(last_move)
+
+    return measure(check, 50) / len(corpus)
+
+
+# bench_one_off_win times Player.one_off_win for both symbols on every position.
+def bench_one_off_win(corpus):
+    from tic_tac_toe import Player
+
+    players = [Player(board, None, "x") for board, last_move in corpus]
+
+    def check():
+
+        for player in players:
+            player.one_off_win("x")
+            player.one_off_win("o")
+
+    return measure(check, 50) / (len(players) * 2)
+
+
+# bench_intelligent_move times the decision intelligent_move makes on every position, without making the move.
+def bench_intelligent_move(corpus):
+
+    def decide():
+        random.seed(CORPUS_SEED)
+
+        for board, last_move in corpus:
+            engine.intelligent_move(board, board.current_symbol)
+
+    return measure(decide, 50) / len(corpus)
+
+
+# bench_headless_game times whole games of intelligent_move against random_move.
+def bench_headless_game(corpus):
+    points = Scoreboard()
+
+    def play():
+        random.seed(CORPUS_SEED)
+
+        for _ in range(200):
+            engine.play_game("intelligent_move", "random_move", points)
+
+    return measure(play, 5) / 200
+
+
+# import_time function returns the fastest time out of the repeats for a new Python process to import the modules,
+# without the time it takes to start Python itself.
+def import_time(modules, repeats=5):
+    directory = os.path.dirname(os.path.abspath(__file__))
+
+    def run(code):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=directory, check=True)
+        return time.perf_counter() - start
+
+    empty = min(run("pass") for _ in range(repeats))
+    return max(1e-6, min(run(f"import {modules}") for _ in range(repeats)) - empty)
+
+
+# bench_import_engine times importing the headless engine.
+def bench_import_engine(corpus):
+    return import_time("engine")
+
+
+# bench_import_game times importing the game, which must not import pygame until the window is opened.
+def bench_import_game(corpus):
+    return import_time("tic_tac_toe")
+
+
+# make_interface function makes a BoardUI under SDL's dummy video driver with a few symbols on the board.
+def make_interface():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from tic_tac_toe import BoardUI
+
+    pygame.init()
+    points = Scoreboard()
+    board = Board(points, verbose=False)
+
+    for move in (5, 1, 9, 3):
+        board.new_move(move, board.current_symbol)
+
+    return BoardUI(board, points)
+
+
+# bench_draw_board times BoardUI.draw_board.
+def bench_draw_board(corpus):
+    interface = make_interface()
+    return measure(interface.draw_board, 200)
+
+
+# bench_load_symbols times BoardUI.load_symbols, which draws a whole frame.
+def bench_load_symbols(corpus):
+    interface = make_interface()
+    return measure(interface.load_symbols, 200)
+
+
+# BENCHMARKS lists every benchmark by name. Each returns the seconds taken per operation, so lower is better.
+BENCHMARKS = {"new_move": bench_new_move,
+              "undo_redo": bench_undo_redo,
+              "check_win": bench_check_win,
+              "one_off_win": bench_one_off_win,
+              "intelligent_move": bench_intelligent_move,
+              "headless_game": bench_headless_game,
+              "draw_board": bench_draw_board,
+              "load_symbols": bench_load_symbols,
+              "import_engine": bench_import_engine,
+              "import_game": bench_import_game}
+
+
+# run_benchmarks function runs the benchmarks with the names given and returns their results.
+def run_benchmarks(names):
+    corpus = make_corpus()
+    results = {}
+
+    for name in names:
+        seconds = BENCHMARKS[name](corpus)
+        results[name] = {"seconds_per_op": seconds, "ops_per_second": 1 / seconds}
+
+    return results
+
+
+# find_regressions function returns the benchmarks that are slower than the baseline by more than the threshold,
+# as a list of the name, the baseline time and the new time.
+def find_regressions(results, baseline, threshold):
+    regressions = []
+
+    for name, result in results.items():
+
+        if name in baseline:
+            old = baseline[name]["seconds_per_op"]
+
+            if result["seconds_per_op"] > old * (1 + threshold):
+                regressions.append((name, old, result["seconds_per_op"]))
+
+    return regressions
+
+
+# find_missed_targets function returns the benchmarks slower than their target, as a list of the name, the target and
+# the time.
+def find_missed_targets(results):
+    return [(name, TARGETS[name], result["seconds_per_op"]) for name, result in results.items()
+            if name in TARGETS and result["seconds_per_op"] > TARGETS[name]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Times the game's hot paths.")
+    parser.add_argument("--output", default=None, help="file the JSON results are written to")
+    parser.add_argument("--baseline", default=None, help="JSON results of an older run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="how much slower counts as a regression")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS), help="benchmarks to run")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.only)
+
+    for name, result in results.items():
+        print(f"{name:<18} {result['seconds_per_op'] * 1e6:>10.2f} us/op {result['ops_per_second']:>12.0f} ops/sec")
+
+    if args.output is not None:
+
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    missed_targets = find_missed_targets(results)
+
+    for name, target, seconds in missed_targets:
+        print(f"TARGET MISSED {name}: {seconds * 1e3:.1f} ms, target {target * 1e3:.1f} ms (compare with --baseline "
+              f"to check it on this computer)")
+
+    if args.baseline is not None:
+
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+        regressions = find_regressions(results, baseline, args.threshold)
+
+        for name, old, new in regressions:
+            print(f"REGRESSION {name}: {old * 1e6:.2f} us/op -> {new * 1e6:.2f} us/op")
+
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
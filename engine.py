@@ -0,0 +1,736 @@
+"""
+Project: Tic-Tac-Toe
+Description: The game logic without any of the display. Holds the Scoreboard and Board classes, the robot strategies
+             and play_game, which plays a whole game between two strategies. Nothing in here imports pygame or waits,
+             so it can be used by tools and workers that don't have a screen.
+"""
+import bisect
+import functools
+import random
+import time
+
+import metrics
+
+# WIN_MASKS stores the 8 winning lines as bitmasks, bit 0 being the top left square and bit 8 the bottom right.
+# They are in the same order the old loops checked them in (rows, columns then diagonals).
+WIN_MASKS = [(0b000000111, "Horizontal"), (0b000111000, "Horizontal"), (0b111000000, "Horizontal"),
+             (0b001001001, "Vertical"), (0b010010010, "Vertical"), (0b100100100, "Vertical"),
+             (0b100010001, "Diagonal"), (0b001010100, "Diagonal")]
+FULL_BOARD = 0b111111111
+
+# DIRECTIONS are the row and column steps of the four directions a line can go through a square.
+DIRECTIONS = [(0, 1, "Horizontal"), (1, 0, "Vertical"), (1, 1, "Diagonal"), (1, -1, "Diagonal")]
+
+
+# line_table function lists every line of k squares on the board, the name of each line and the lines that go through
+# each square. On the 3x3 board the lines are in the same order as WIN_MASKS. It is only worked out once for each size.
+@functools.lru_cache(maxsize=None)
+def line_table(rows, columns, k):
+    lines = []
+    names = []
+    square_lines = [[] for _ in range(rows * columns)]
+
+    for row_step, column_step, name in DIRECTIONS:
+
+        for row in range(rows):
+
+            for column in range(columns):
+                last_row = row + row_step * (k - 1)
+                last_column = column + column_step * (k - 1)
+
+                if (0 <= last_row < rows) and (0 <= last_column < columns):
+                    line = [(row + row_step * step) * columns + column + column_step * step for step in range(k)]
+
+                    for square in line:
+                        square_lines[square].append(len(lines))
+
+                    lines.append(line)
+                    names.append(name)
+
+    return lines, names, square_lines
+
+
+# zobrist_keys function gives every symbol on every square a random 64-bit number. A board's hash is all the numbers of
+# its pieces XORed together, so it changes by one XOR when a piece is added or taken away. The numbers come from a
+# fixed seed, so a board has the same hash in every process.
+@functools.lru_cache(maxsize=None)
+def zobrist_keys(size):
+    generator = random.Random(size)
+    return {symbol: [generator.getrandbits(64) for _ in range(size)] for symbol in ("x", "o")}
+
+
+# Scoreboard class keeps track of the score.
+class Scoreboard:
+
+    # Initiates the default values. If store is set every result and reset is also recorded to it, see scorestore.py.
+    def __init__(self):
+        self.x_score = 0
+        self.o_score = 0
+        self.draw = 0
+        self.store = None
+
+    # add_score method adds one points to the symbol put in the parameter. Can only be x or o.
+    def add_score(self, symbol):
+
+        if self.store is not None:
+            self.store.record(symbol)
+
+        # Checks what symbol is in the parameter and adds one to their score.
+        if symbol == "x":
+            self.x_score += 1
+
+        elif symbol == "o":
+            self.o_score += 1
+
+        elif symbol == "d":
+            self.draw += 1
+
+    # get_x_score method returns the x player's score.
+    def get_x_score(self):
+        return self.x_score
+
+    # get_o_score method returns the o player's score.
+    def get_o_score(self):
+        return self.o_score
+
+    # merge method adds the scores from another scoreboard to this one, used to combine results from workers.
+    def merge(self, other):
+        self.x_score += other.x_score
+        self.o_score += other.o_score
+        self.draw += other.draw
+
+    # total_games method returns how many games the scoreboard has recorded.
+    def total_games(self):
+        return self.x_score + self.o_score + self.draw
+
+    # Returns a readable version of the score if class is printed.
+    def __str__(self):
+        return (f"X : {self.x_score}"
+                f"O : {self.o_score}")
+
+    # reset method resets the players scores.
+    def reset(self):
+        print("Score Reset")
+
+        if self.store is not None:
+            self.store.record("reset")
+
+        self.o_score = 0
+        self.x_score = 0
+        self.draw = 0
+
+
+# Board class keeps track of moves done and checks if there is a win, and if so gives it to the Scoreboard class.
+class Board:
+
+    # Initiates the defaults values and the defaults scoreboard object being used.
+    # If bitboard is True each symbol's pieces are also kept as an integer with a bit per square, so checks are done
+    # with bitwise ops. If verbose is False the board doesn't print the type of win, which is used when playing lots
+    # of games. rows, columns and k set the size of the board and how many in a row wins, e.g. 15, 15, 5 for gomoku.
+    def __init__(self, points, bitboard=True, verbose=True, rows=3, columns=3, k=3):
+        self.rows = rows
+        self.columns = columns
+        self.k = k
+        self.size = rows * columns
+        self.full_board = (1 << self.size) - 1
+        # standard is True for the normal 3x3 board, which can use the original loops instead of walking.
+        self.standard = (rows, columns, k) == (3, 3, 3)
+        self.moves = [" "] * self.size
+        self.bitboard = bitboard
+        # nested is True for boards made of smaller boards, like ultimate tic-tac-toe's, which don't keep the lines.
+        self.nested = False
+        self.verbose = verbose
+        self.bits = {"x": 0, "o": 0}
+        # lines, line_names and square_lines describe every line of k squares. line_counts keeps how many of each
+        # symbol is on every line and threats keeps the lines a symbol only needs one more square on to win.
+        self.lines, self.line_names, self.square_lines = line_table(rows, columns, k)
+        self.line_counts = {"x": [0] * len(self.lines), "o": [0] * len(self.lines)}
+        self.threats = {"x": set(), "o": set()}
+        # hash is the Zobrist hash of the pieces on the board, zobrist holds the numbers it is made from. It doesn't
+        # include whose turn it is, so use it with the symbol to move as a key.
+        self.zobrist = zobrist_keys(self.size)
+        self.hash = 0
+        self.total_moves = 0
+        self.total_games = 0
+        self.last_result = None
+        # history lists the squares played this game in order, it is also what undo takes moves back from. redo_moves
+        # holds the moves taken back with their symbols, the last one taken back at the end. If log is set every
+        # finished game is recorded to it with the names of the strategies in strategy_names.
+        self.history = []
+        self.redo_moves = []
+        self.log = None
+        self.strategy_names = {"x": "human", "o": "human"}
+        self.points = points
+        self.mode = "pvp"
+        self.mode_hover = "none"
+        self.reset_hover = "none"
+        self.current_symbol = "x"
+        self.possible_moves = list(range(1, self.size + 1))
+
+    # new_move method records a move and takes it out of the possible moves list. Swaps what players turn it is.
+    # A new move can't be redone over, so the moves taken back are forgotten.
+    def new_move(self, move, symbol):
+        self.moves[move - 1] = symbol
+        self.bits[symbol] |= 1 << (move - 1)
+        self.possible_moves.remove(move)
+        self.history.append(move)
+        self.hash ^= self.zobrist[symbol][move - 1]
+        self.total_moves += 1
+
+        if self.redo_moves:
+            self.redo_moves = []
+
+        if self.bitboard:
+            self.update_lines(move, symbol)
+
+        self.check_win(move)
+
+        match self.current_symbol:
+
+            case "x":
+                self.current_symbol = "o"
+
+            case "o":
+                self.current_symbol = "x"
+
+    # place method puts the symbol on the square like new_move, without checking for a win or changing whose turn
+    # it is. Search robots use it with undo to try moves on the board itself instead of copying it.
+    def place(self, move, symbol):
+        self.moves[move - 1] = symbol
+        self.bits[symbol] |= 1 << (move - 1)
+        self.possible_moves.remove(move)
+        self.history.append(move)
+        self.hash ^= self.zobrist[symbol][move - 1]
+        self.total_moves += 1
+
+        if self.bitboard:
+            self.update_lines(move, symbol)
+
+    # unplace method takes the last piece played off the board and puts back everything place changed, returning its
+    # square and symbol. It doesn't change whose turn it is, so search robots can use it to take back a move they
+    # tried with place.
+    def unplace(self):
+        move = self.history.pop()
+        symbol = self.moves[move - 1]
+        self.moves[move - 1] = " "
+        self.bits[symbol] &= ~(1 << (move - 1))
+        # possible_moves is always in order, so putting the square back in order puts it back where it was.
+        bisect.insort(self.possible_moves, move)
+        self.hash ^= self.zobrist[symbol][move - 1]
+        self.total_moves -= 1
+
+        if self.bitboard:
+            self.remove_lines(move, symbol)
+
+        return move, symbol
+
+    # undo method takes back the last move of this game and gives the turn back, returning the square or 0 if there
+    # isn't a move to take back. Everything new_move changed is put back the way it was before it.
+    def undo(self):
+
+        if not self.history:
+            return 0
+
+        move, symbol = self.unplace()
+        self.redo_moves.append((move, symbol))
+
+        match self.current_symbol:
+
+            case "x":
+                self.current_symbol = "o"
+
+            case "o":
+                self.current_symbol = "x"
+
+        return move
+
+    # redo method plays the last move taken back again, returning the square or 0 if there isn't one.
+    def redo(self):
+
+        if not self.redo_moves:
+            return 0
+
+        redo_moves = self.redo_moves
+        move, symbol = redo_moves.pop()
+        self.new_move(move, symbol)
+        self.redo_moves = redo_moves
+        return move
+
+    # copy method returns a new board in the same position with its own score, so a robot can think on it while this
+    # board keeps being used. The copy doesn't print, log or keep the moves that were taken back.
+    def copy(self):
+        board = Board(Scoreboard(), self.bitboard, False, self.rows, self.columns, self.k)
+        board.moves = list(self.moves)
+        board.bits = dict(self.bits)
+        board.line_counts = {symbol: list(counts) for symbol, counts in self.line_counts.items()}
+        board.threats = {symbol: set(threats) for symbol, threats in self.threats.items()}
+        board.possible_moves = list(self.possible_moves)
+        board.history = list(self.history)
+        board.hash = self.hash
+        board.total_moves = self.total_moves
+        board.current_symbol = self.current_symbol
+        return board
+
+    # Returns a readable version of the board if the method is printed.
+    def __str__(self):
+        rows = []
+
+        for row in range(self.rows):
+            rows.append("| " + " | ".join(self.moves[row * self.columns:(row + 1) * self.columns]) + " |")
+
+        return f"\n{'- ' * (self.columns * 2)}-\n".join(rows)
+
+    # get_moves method returns a list that represents the board to show what piece is where.
+    def get_moves(self):
+        return self.moves
+
+    # reset method makes the board empty, resetting back to the default values. This does not change the score.
+    def reset(self):
+        self.moves = [" "] * self.size
+        self.bits = {"x": 0, "o": 0}
+        self.line_counts = {"x": [0] * len(self.lines), "o": [0] * len(self.lines)}
+        self.threats = {"x": set(), "o": set()}
+        self.possible_moves = list(range(1, self.size + 1))
+        self.history = []
+        self.redo_moves = []
+        self.hash = 0
+        self.total_moves = 0
+
+    # is_legal method checks if the square (1 to the size of the board) is still empty. Any other square is never legal.
+    def is_legal(self, move):
+
+        if not 1 <= move <= self.size:
+            return False
+
+        if self.bitboard:
+            return not ((self.bits["x"] | self.bits["o"]) >> (move - 1)) & 1
+
+        return self.moves[move - 1] == " "
+
+    # center method returns the middle square, or the one just above and left of the middle if there isn't one.
+    def center(self):
+        return ((self.rows - 1) // 2) * self.columns + ((self.columns - 1) // 2) + 1
+
+    # line_through method returns the name of the line the symbol would have k in a row on if it was on the square,
+    # or None if there isn't one. It only walks the four directions out from that square, so the board size doesn't
+    # matter. The square itself isn't checked, so it also tells if playing an empty square would win.
+    def line_through(self, move, symbol):
+        row, column = divmod(move - 1, self.columns)
+
+        for row_step, column_step, line in DIRECTIONS:
+            total = 1
+
+            for direction in (1, -1):
+                next_row = row + row_step * direction
+                next_column = column + column_step * direction
+
+                while (0 <= next_row < self.rows) and (0 <= next_column < self.columns) and \
+                        self.moves[next_row * self.columns + next_column] == symbol:
+                    total += 1
+                    next_row += row_step * direction
+                    next_column += column_step * direction
+
+            if total >= self.k:
+                return line
+
+        return None
+
+    # update_lines method adds the move to the count of every line going through it and updates the threats.
+    # Only the lines through the square are touched, so it takes the same time on any size of board.
+    def update_lines(self, move, symbol):
+        opposing_symbol = opposite_symbol(symbol)
+        counts = self.line_counts[symbol]
+        opposing_counts = self.line_counts[opposing_symbol]
+        threats = self.threats[symbol]
+        opposing_threats = self.threats[opposing_symbol]
+
+        for line in self.square_lines[move - 1]:
+            counts[line] += 1
+
+            # The opposing symbol can't win on this line any more.
+            opposing_threats.discard(line)
+
+            if counts[line] == self.k - 1 and opposing_counts[line] == 0:
+                threats.add(line)
+
+            elif counts[line] == self.k:
+                threats.discard(line)
+
+    # remove_lines method takes the move off the count of every line going through it, which undoes update_lines.
+    # A line is a threat for a symbol when it has k - 1 of that symbol and none of the other.
+    def remove_lines(self, move, symbol):
+        opposing_symbol = opposite_symbol(symbol)
+        counts = self.line_counts[symbol]
+        opposing_counts = self.line_counts[opposing_symbol]
+
+        for line in self.square_lines[move - 1]:
+            counts[line] -= 1
+
+            if counts[line] == self.k - 1 and opposing_counts[line] == 0:
+                self.threats[symbol].add(line)
+
+            else:
+                self.threats[symbol].discard(line)
+
+            if opposing_counts[line] == self.k - 1 and counts[line] == 0:
+                self.threats[opposing_symbol].add(line)
+
+    # winning_square method returns the square (1 to the size of the board) the symbol could win with next move, or 0
+    # if there isn't one. If there is more than one it picks the one on the first line, like the original loops did.
+    def winning_square(self, symbol):
+        threats = self.threats[symbol]
+
+        if not threats:
+            return 0
+
+        for square in self.lines[min(threats)]:
+
+            if self.moves[square] == " ":
+                return square + 1
+
+        return 0
+
+    # new_game method does the same as the reset method, but it resets the score as well.
+    def new_game(self):
+        self.reset()
+        self.points.reset()
+
+    # win method updates the score and gets it ready for a new game.
+    # Also keeps track of the total games when in "rvr" mode, so it can reset after 3 games.
+    # Allows three symbols 'x', 'o' and 'd' (draw).
+    def win(self, symbol):
+
+        # Records the game before the board is reset. Whoever played the first square started the game.
+        if (self.log is not None) and self.history:
+            self.log.record(self.history, symbol, self.moves[self.history[0] - 1], self.strategy_names["x"],
+                            self.strategy_names["o"])
+
+        self.reset()
+        self.points.add_score(symbol)
+        self.last_result = symbol
+
+        if metrics.active is not None:
+            metrics.active.increment("games_total", label=symbol)
+            # Programs without a window have no frames to write the metrics from, so they are also written after a
+            # game.
+            metrics.active.maybe_flush()
+
+        if self.mode == "rvr":
+            self.total_games += 1
+
+        # Goes to menu after three games in "rvr", so there isn't an infinite loop.
+        if self.total_games == 3:
+            self.mode = "menu"
+            self.total_games = 0
+            self.mode_hover = "none"
+            self.reset()
+
+    # check_win method checks if any player has won, and if so calls the win method, also checks if it is a draw.
+    # Note that this method doesn't check pre-defined conditions, but independently checks for a win.
+    # move is the square just played, only the lines going through it are checked unless it is the 3x3 board without
+    # the bitboard.
+    def check_win(self, move):
+
+        # Uses the line counts if the bitboard is on, a line has been won if it has k of the symbol.
+        if self.bitboard:
+            symbol = self.moves[move - 1]
+            counts = self.line_counts[symbol]
+
+            for line in self.square_lines[move - 1]:
+
+                if counts[line] == self.k:
+
+                    if self.verbose:
+                        print(f"{self.line_names[line]} Win!")
+
+                    self.win(symbol)
+                    return
+
+            if (self.bits["x"] | self.bits["o"]) == self.full_board:
+                self.win("d")
+
+            return
+
+        # Walks out from the last move if the board isn't the standard one, so a big board is never fully rescanned.
+        if not self.standard:
+            line = self.line_through(move, self.moves[move - 1])
+
+            if line is not None:
+
+                if self.verbose:
+                    print(f"{line} Win!")
+
+                self.win(self.moves[move - 1])
+
+            elif self.total_moves == self.size:
+                self.win("d")
+
+            return
+
+        # Checks for a horizontal win.
+        for column in range(3):
+            total_symbol = 0
+
+            for row in range(3):
+
+                if self.moves[(column * 3) + row] == self.current_symbol:
+                    total_symbol += 1
+
+            if total_symbol == 3:
+
+                if self.verbose:
+                    print("Horizontal Win!")
+
+                self.win(self.current_symbol)
+
+        # Checks for a vertical win.
+        for row in range(3):
+            total_symbol = 0
+
+            for column in range(3):
+
+                if self.moves[(column * 3) + row] == self.current_symbol:
+                    total_symbol += 1
+
+            if total_symbol == 3:
+
+                if self.verbose:
+                    print("Vertical Win!")
+
+                self.win(self.current_symbol)
+
+        # Checks for a diagonal win.
+        for diagonal in range(2):
+            total_symbol = 0
+
+            for intercept in range(3):
+
+                if (diagonal * 2) == 0:
+
+                    if self.moves[intercept * 4] == self.current_symbol:
+                        total_symbol += 1
+
+                else:
+
+                    if self.moves[(diagonal * 2) + (intercept * 2)] == self.current_symbol:
+                        total_symbol += 1
+
+            if total_symbol == 3:
+
+                if self.verbose:
+                    print("Diagonal Win!")
+
+                self.win(self.current_symbol)
+
+        # Calls win if it is a draw.
+        if self.total_moves == 9:
+            self.win("d")
+
+
+# opposite_symbol determines the opposite symbol of the given symbol in its parameter.
+def opposite_symbol(symbol):
+
+    match symbol:
+
+        case "x":
+            return "o"
+
+        case "o":
+            return "x"
+
+
+# check_lines function raises ValueError if the board doesn't keep its lines, which the strategies that look for a
+# line to finish or block need.
+def check_lines(board, strategy):
+
+    if board.nested:
+        raise ValueError(f"{strategy} doesn't work on a board of boards")
+
+
+# one_off_win checks if the given player is one off of making a move and returns the position of that move.
+# This was a modified version of the check win method from the board class. Returns 0 if there isn't one.
+def one_off_win(board, current_symbol):
+
+    check_lines(board, "one_off_win")
+    opposing_symbol = opposite_symbol(current_symbol)
+
+    # Uses the threats kept by the board if the bitboard is on, so there is nothing to search.
+    if board.bitboard:
+        return board.winning_square(current_symbol)
+
+    # Checks every empty square for any other size than 3x3, returning the first one that would win.
+    if not board.standard:
+
+        for move in board.possible_moves:
+
+            if board.line_through(move, current_symbol) is not None:
+                return move
+
+        return 0
+
+    # Checks for a horizontal one off.
+    for column in range(3):
+        total_symbol = 0
+        missing_symbol = []
+
+        for row in range(3):
+
+            if board.moves[(column * 3) + row] == current_symbol:
+                total_symbol += 1
+
+            elif board.moves[(column * 3) + row] != opposing_symbol:
+                missing_symbol.append((column * 3) + row)
+
+        if (total_symbol == 2) & (len(missing_symbol) > 0):
+            return int(missing_symbol[0] + 1)
+
+    # Checks for a vertical one off.
+    for row in range(3):
+        total_symbol = 0
+        missing_symbol = []
+
+        for column in range(3):
+
+            if board.moves[(column * 3) + row] == current_symbol:
+                total_symbol += 1
+
+            elif board.moves[(column * 3) + row] != opposing_symbol:
+                missing_symbol.append((column * 3) + row)
+
+        if (total_symbol == 2) & (len(missing_symbol) > 0):
+            return int(missing_symbol[0] + 1)
+
+    # Checks for a diagonal one off.
+    for diagonal in range(2):
+        total_symbol = 0
+        missing_symbol = []
+
+        for intercept in range(3):
+
+            if (diagonal * 2) == 0:
+
+                if board.moves[intercept * 4] == current_symbol:
+                    total_symbol += 1
+
+                elif board.moves[intercept * 4] != opposing_symbol:
+                    missing_symbol.append(intercept * 4)
+
+            elif not ((diagonal * 2) == 0):
+
+                if board.moves[(diagonal * 2) + (intercept * 2)] == current_symbol:
+                    total_symbol += 1
+
+                elif board.moves[(diagonal * 2) + (intercept * 2)] != opposing_symbol:
+                    missing_symbol.append((diagonal * 2) + (intercept * 2))
+
+        if (total_symbol == 2) & (len(missing_symbol) > 0):
+            return int(missing_symbol[0] + 1)
+
+    return 0
+
+
+# random_move strategy was the original robot decision-making. It picks any of the possible moves.
+def random_move(board, symbol):
+    return random.choice(board.possible_moves)
+
+
+# intelligent_move strategy is used by the robot to decide its move.
+def intelligent_move(board, symbol):
+
+    check_lines(board, "intelligent_move")
+
+    # Firstly checks if the middle square is empty, so it can take it first.
+    if board.is_legal(board.center()):
+        return board.center()
+
+    # Secondly checks if it is one square off of a win and does so.
+    attack_move = one_off_win(board, symbol)
+
+    if attack_move != 0:
+        return attack_move
+
+    # Thirdly checks if the enemy is one square off of a win and does so.
+    block_move = one_off_win(board, opposite_symbol(symbol))
+
+    if block_move != 0:
+        return block_move
+
+    # If all the conditions above are not true it places a random move.
+    return random_move(board, symbol)
+
+
+# STRATEGIES lets a strategy be chosen by its name. Every strategy takes the board and its symbol and returns the
+# square (1 to the size of the board) it wants to play.
+STRATEGIES = {"random_move": random_move, "intelligent_move": intelligent_move}
+
+
+# STANDARD_STRATEGIES are the strategies that only work on the standard 3x3 board.
+STANDARD_STRATEGIES = ("perfect_move", "table_move")
+
+
+# size_error function returns why one of the strategies can't play on a board of this size, or None if they all can.
+# The programs that take a board size give it to parser.error.
+def size_error(strategies, rows, columns, k):
+
+    if (rows, columns, k) == (3, 3, 3):
+        return None
+
+    for strategy in strategies:
+
+        if strategy in STANDARD_STRATEGIES:
+            return f"{strategy} only works on the 3x3 board"
+
+    return None
+
+
+# SEARCHERS lists the searchers of the robots that think for a while. Every one has a stop method that makes the
+# search it is doing return straight away, with whatever move it has found so far.
+SEARCHERS = []
+
+
+# stop_searches function stops every search that is running, used when the move being worked out isn't wanted any more.
+def stop_searches():
+
+    for searcher in SEARCHERS:
+        searcher.stop()
+
+
+# decide function asks the strategy for its move. If metrics are turned on it also records how long the decision took.
+def decide(strategy, board, symbol):
+    function = STRATEGIES.get(strategy, strategy)
+
+    if metrics.active is None:
+        return function(board, symbol)
+
+    start = time.perf_counter()
+    move = function(board, symbol)
+    metrics.active.observe("robot_decision_seconds", time.perf_counter() - start, function.__name__)
+    return move
+
+
+# play_game plays one whole game between two strategies and returns the result, 'x', 'o' or 'd' (draw).
+# Strategies can be given as functions or by their name in STRATEGIES. The result is also added to points if given.
+# rows, columns and k set the size of the board like they do for the Board class. If log is given the game is
+# recorded to it.
+def play_game(x_strategy, o_strategy, points=None, rows=3, columns=3, k=3, log=None):
+
+    if points is None:
+        points = Scoreboard()
+
+    strategies = {"x": STRATEGIES.get(x_strategy, x_strategy), "o": STRATEGIES.get(o_strategy, o_strategy)}
+    board = Board(points, verbose=False, rows=rows, columns=columns, k=k)
+    board.log = log
+    board.strategy_names = {"x": strategies["x"].__name__, "o": strategies["o"].__name__}
+
+    # The board resets itself once the game is over, so the game is finished when the total moves go back to 0.
+    while True:
+        symbol = board.current_symbol
+
+        if metrics.active is None:
+            board.new_move(strategies[symbol](board, symbol), symbol)
+
+        else:
+            board.new_move(decide(strategies[symbol], board, symbol), symbol)
+
+        if board.total_moves == 0:
+            return board.last_result
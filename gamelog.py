@@ -0,0 +1,240 @@
+"""
+Project: Tic-Tac-Toe
+Description: Keeps every finished game in a small binary file that is only ever appended to, and reads it back one
+             game at a time so a log of millions of games never has to fit in memory.
+             Each game takes 2 bytes plus half a byte a move, so never more than 7 bytes. The first byte holds the
+             number of moves, the result and who moved first, the second the strategies x and o used, and the rest
+             the squares played, two to a byte. Only for the standard 3x3 board.
+Usage: python gamelog.py stats FILE
+"""
+import argparse
+import collections
+import os
+
+MAGIC = b"TTTL"
+VERSION = 1
+HEADER = MAGIC + bytes([VERSION])
+
+# RESULTS and STRATEGY_NAMES give the numbers the results and strategies are stored as. A strategy that isn't listed
+# is stored as OTHER. New strategies are only ever added to the end, so old logs keep reading the same.
+RESULTS = ["x", "o", "d"]
+STRATEGY_NAMES = ["human", "random_move", "intelligent_move", "perfect_move", "table_move", "mcts_move",
+                  "ultimate_move"]
+OTHER = 15
+
+# BUFFER_SIZE is how many bytes are kept before they are written, and how many are read at a time.
+BUFFER_SIZE = 1 << 16
+
+# GameRecord is one game read back from the log. moves is a tuple of the squares (1 to 9) in the order they were played.
+GameRecord = collections.namedtuple("GameRecord", ["moves", "result", "first", "x_strategy", "o_strategy"])
+
+
+# strategy_id function returns the number the strategy name is stored as.
+def strategy_id(name):
+
+    if name in STRATEGY_NAMES:
+        return STRATEGY_NAMES.index(name)
+
+    return OTHER
+
+
+# strategy_name function returns the strategy name for the stored number.
+def strategy_name(number):
+
+    if number < len(STRATEGY_NAMES):
+        return STRATEGY_NAMES[number]
+
+    return "other"
+
+
+# encode function packs one game into bytes.
+def encode(moves, result, first, x_strategy, o_strategy):
+
+    if len(moves) > 9 or any(not 1 <= move <= 9 for move in moves):
+        raise ValueError("only games on the 3x3 board can be logged")
+
+    record = bytearray([len(moves) | RESULTS.index(result) << 4 | (first == "o") << 6,
+                        strategy_id(x_strategy) | strategy_id(o_strategy) << 4])
+
+    # Two moves a byte, the first in the low half. An odd last move leaves the high half empty.
+    for number in range(0, len(moves), 2):
+        pair = moves[number:number + 2]
+        record.append((pair[0] - 1) | ((pair[1] - 1) << 4 if len(pair) == 2 else 0))
+
+    return bytes(record)
+
+
+# record_size function returns how many bytes the game starting with the byte takes.
+def record_size(first_byte):
+    return 2 + ((first_byte & 15) + 1) // 2
+
+
+# decode function unpacks the game that starts at offset in data.
+def decode(data, offset=0):
+    flags = data[offset]
+    strategies = data[offset + 1]
+    count = flags & 15
+    moves = []
+
+    for number in range(count):
+        pair = data[offset + 2 + number // 2]
+        moves.append((pair >> 4 if number % 2 else pair & 15) + 1)
+
+    return GameRecord(tuple(moves), RESULTS[flags >> 4 & 3], "o" if flags >> 6 & 1 else "x",
+                      strategy_name(strategies & 15), strategy_name(strategies >> 4))
+
+
+# GameLog class appends games to a log file, keeping them in a buffer and writing them in large blocks.
+class GameLog:
+
+    # Opens the log for appending, writing the header first if the file is new or empty.
+    def __init__(self, path):
+        self.path = path
+        self.buffer = bytearray()
+        self.games = 0
+        self.file = open(path, "ab")
+
+        if self.file.tell() == 0:
+            self.file.write(HEADER)
+
+    # record method adds a finished game. moves are the squares played in order, result is "x", "o" or "d" and first
+    # is the symbol that moved first.
+    def record(self, moves, result, first, x_strategy="human", o_strategy="human"):
+        self.buffer += encode(moves, result, first, x_strategy, o_strategy)
+        self.games += 1
+
+        if len(self.buffer) >= BUFFER_SIZE:
+            self.flush()
+
+    # flush method writes the buffer to the file.
+    def flush(self):
+        self.file.write(self.buffer)
+        self.file.flush()
+        self.buffer.clear()
+
+    # close method writes what is left and closes the file.
+    def close(self):
+
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+
+# read_games function reads the log at the path and yields one GameRecord at a time, reading it in blocks. A game cut
+# off at the end of the file, from a program that stopped while writing, is skipped.
+def read_games(path):
+
+    with open(path, "rb") as file:
+
+        if file.read(len(HEADER)) != HEADER:
+            raise ValueError(f"{path} is not a game log")
+
+        data = b""
+
+        while True:
+            block = file.read(BUFFER_SIZE)
+
+            if not block:
+                return
+
+            data += block
+            offset = 0
+
+            while offset < len(data) and offset + record_size(data[offset]) <= len(data):
+                yield decode(data, offset)
+                offset += record_size(data[offset])
+
+            data = data[offset:]
+
+
+# append_log function adds every game from the log at source to the end of the log at destination.
+def append_log(source, destination):
+
+    with open(source, "rb") as file:
+
+        if file.read(len(HEADER)) != HEADER:
+            raise ValueError(f"{source} is not a game log")
+
+        GameLog(destination).close()
+
+        with open(destination, "ab") as output:
+
+            while True:
+                block = file.read(BUFFER_SIZE)
+
+                if not block:
+                    break
+
+                output.write(block)
+
+
+# stats function reads the whole log once and returns the totals, the results of every opening square and the results
+# of every strategy.
+def stats(path):
+    totals = collections.Counter()
+    openings = collections.defaultdict(collections.Counter)
+    strategies = collections.defaultdict(collections.Counter)
+    lengths = collections.Counter()
+
+    for game in read_games(path):
+        totals[game.result] += 1
+        lengths[len(game.moves)] += 1
+
+        if game.moves:
+            openings[game.moves[0]][game.result] += 1
+
+        # A strategy's results are counted as wins, losses and draws from its own side.
+        for symbol, name in (("x", game.x_strategy), ("o", game.o_strategy)):
+
+            if game.result == "d":
+                strategies[name]["draw"] += 1
+            elif game.result == symbol:
+                strategies[name]["win"] += 1
+            else:
+                strategies[name]["loss"] += 1
+
+    return totals, openings, strategies, lengths
+
+
+# percent function returns the part as a percentage of the whole, or 0 if the whole is 0.
+def percent(part, whole):
+    return 100 * part / whole if whole else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reads a game log.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    stats_parser = subparsers.add_parser("stats", help="prints win rates, openings and strategy results")
+    stats_parser.add_argument("path", help="game log to read")
+    args = parser.parse_args()
+
+    totals, openings, strategies, lengths = stats(args.path)
+    games = sum(totals.values())
+    print(f"{games} games, {os.path.getsize(args.path)} bytes")
+    print(f"x wins {totals['x']} ({percent(totals['x'], games):.1f}%), o wins {totals['o']} "
+          f"({percent(totals['o'], games):.1f}%), draws {totals['d']} ({percent(totals['d'], games):.1f}%)")
+
+    print("\nOpening square     games      x%      o%      d%")
+
+    for square in sorted(openings):
+        results = openings[square]
+        count = sum(results.values())
+        print(f"{square:<14} {count:>9} {percent(results['x'], count):>7.1f} {percent(results['o'], count):>7.1f} "
+              f"{percent(results['d'], count):>7.1f}")
+
+    print("\nStrategy              games    win%   loss%   draw%")
+
+    for name in sorted(strategies):
+        results = strategies[name]
+        count = sum(results.values())
+        print(f"{name:<17} {count:>9} {percent(results['win'], count):>7.1f} {percent(results['loss'], count):>7.1f} "
+              f"{percent(results['draw'], count):>7.1f}")
+
+    print("\nMoves     games")
+
+    for length in sorted(lengths):
+        print(f"{length:<5} {lengths[length]:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Project: Tic-Tac-Toe
+Description: A robot that plays by Monte Carlo tree search (UCT). It plays random games from the current position,
+             spending more of them on the moves that have done well so far, until its time or game budget runs out,
+             so the more time it is given the stronger it plays. The tree is kept between moves of the same game.
+             With more than one worker every worker grows its own tree over the same budget and their counts are
+             added together. Works on any board size.
+"""
+import math
+import random
+import time
+
+import engine
+
+# TIME_BUDGET is how many seconds a move takes unless it is changed, and EXPLORATION how much UCT tries moves that
+# haven't been played much over the ones that have done well.
+TIME_BUDGET = 0.05
+EXPLORATION = 1.4
+
+# CHECK_EVERY is how many games are played between checks of the clock.
+CHECK_EVERY = 16
+
+
+# position function returns what the search needs to know about the board, small enough to send to a worker: the
+# size, the squares played in order, the bitboards and the empty squares (all 0 based).
+def position(board):
+    return ((board.rows, board.columns, board.k), tuple(move - 1 for move in board.history), dict(board.bits),
+            tuple(move - 1 for move in board.possible_moves))
+
+
+# Node class is one position in the tree. wins counts the games won by the player who moved into it, a draw is half.
+class Node:
+
+    # Initiates the node for the position after the move (0 based) was played by the other player. winner is "x",
+    # "o", "d" or None if the game isn't over.
+    def __init__(self, parent, move, bits, to_move, empty, winner):
+        self.parent = parent
+        self.move = move
+        self.bits = bits
+        self.to_move = to_move
+        self.empty = empty
+        self.winner = winner
+        self.untried = [] if winner is not None else list(empty)
+        self.children = {}
+        self.wins = 0.0
+        self.visits = 0
+
+
+# MCTS class searches from a position and keeps its tree, so the next move of the same game starts where it left off.
+class MCTS:
+
+    # Initiates the search. time_budget is the seconds a move takes and iterations the number of games played, the
+    # search stops at whichever comes first (either can be None). workers is how many processes search together.
+    def __init__(self, time_budget=TIME_BUDGET, iterations=None, workers=1, exploration=EXPLORATION, seed=None):
+        self.time_budget = time_budget
+        self.iterations = iterations
+        self.workers = workers
+        self.exploration = exploration
+        self.generator = random.Random(seed)
+        self.root = None
+        self.root_history = ()
+        self.size = None
+        self.square_masks = []
+        self.pool = None
+        self.reused = 0
+        # stopping is set by stop to end the search early, it is cleared when the next move starts.
+        self.stopping = False
+
+    # set_size method works out the masks of the lines through every square for the board size.
+    def set_size(self, rows, columns, k):
+
+        if self.size != (rows, columns, k):
+            lines, names, square_lines = engine.line_table(rows, columns, k)
+            masks = [sum(1 << square for square in line) for line in lines]
+            self.square_masks = [[masks[line] for line in square_line] for square_line in square_lines]
+            self.size = (rows, columns, k)
+            self.root = None
+
+    # wins method checks if the pieces win with a line through the square.
+    def wins(self, pieces, square):
+
+        for mask in self.square_masks[square]:
+
+            if pieces & mask == mask:
+                return True
+
+        return False
+
+    # expand method adds the child of the node for the square.
+    def expand(self, node, square):
+        player = node.to_move
+        bits = dict(node.bits)
+        bits[player] |= 1 << square
+        empty = tuple(spot for spot in node.empty if spot != square)
+        winner = None
+
+        if self.wins(bits[player], square):
+            winner = player
+        elif not empty:
+            winner = "d"
+
+        child = Node(node, square, bits, engine.opposite_symbol(player), empty, winner)
+        node.children[square] = child
+        return child
+
+    # playout method plays random moves from the node until the game is over and returns the result.
+    def playout(self, node):
+
+        if node.winner is not None:
+            return node.winner
+
+        bits = dict(node.bits)
+        player = node.to_move
+        empty = list(node.empty)
+        self.generator.shuffle(empty)
+
+        # Playing the squares in a shuffled order is the same as picking a random square every move.
+        for square in empty:
+            bits[player] |= 1 << square
+
+            if self.wins(bits[player], square):
+                return player
+
+            player = "o" if player == "x" else "x"
+
+        return "d"
+
+    # select method walks down the tree by UCT to a node that still has untried moves or is over, and expands it.
+    def select(self, node):
+
+        while (not node.untried) and node.children:
+            scale = self.exploration * math.sqrt(math.log(node.visits))
+            node = max(node.children.values(),
+                       key=lambda child: child.wins / child.visits + scale / math.sqrt(child.visits))
+
+        if node.untried:
+            square = node.untried.pop(self.generator.randrange(len(node.untried)))
+            node = self.expand(node, square)
+
+        return node
+
+    # iterate method plays one game: select, expand, play out and count the result back up the tree.
+    def iterate(self, root):
+        node = self.select(root)
+        result = self.playout(node)
+
+        while node is not None:
+            node.visits += 1
+
+            if result == "d":
+                node.wins += 0.5
+
+            elif node.parent is not None and result == node.parent.to_move:
+                node.wins += 1
+
+            node = node.parent
+
+    # find_root method returns the root for the position, the node of the last search if this position follows on
+    # from it in the same game, or a new one.
+    def find_root(self, state, symbol):
+        size, history, bits, empty = state
+        self.set_size(*size)
+        node = None
+
+        if (self.root is not None) and (history[:len(self.root_history)] == self.root_history):
+            node = self.root
+
+            for square in history[len(self.root_history):]:
+                node = node.children.get(square)
+
+                if node is None:
+                    break
+
+        if (node is None) or (node.to_move != symbol) or (node.bits != bits):
+            node = Node(None, None, bits, symbol, empty, None)
+        else:
+            self.reused += 1
+
+        # The rest of the tree above the new root can't be reached again, so it is let go.
+        node.parent = None
+        self.root = node
+        self.root_history = history
+        return node
+
+    # search method grows the tree from the root until the deadline or the number of games is reached.
+    def search(self, root, deadline, iterations):
+        played = 0
+
+        while (iterations is None) or (played < iterations):
+            self.iterate(root)
+            played += 1
+
+            if played % CHECK_EVERY == 0:
+
+                if self.stopping or ((deadline is not None) and (time.monotonic() >= deadline)):
+                    break
+
+        return played
+
+    # statistics method searches the position and returns the visits and wins of every move from it, keyed by square.
+    def statistics(self, state, symbol, deadline, iterations):
+        root = self.find_root(state, symbol)
+        self.search(root, deadline, iterations)
+        return {square: (child.visits, child.wins) for square, child in root.children.items()}
+
+    # best_move method returns the square (1 to the size of the board) with the most visits after the search.
+    def best_move(self, board, symbol):
+        self.stopping = False
+
+        if (self.time_budget is None) and (self.iterations is None):
+            raise ValueError("MCTS needs a time budget or a number of iterations")
+
+        if len(board.possible_moves) == 1:
+            return board.possible_moves[0]
+
+        deadline = None if self.time_budget is None else time.monotonic() + self.time_budget
+        state = position(board)
+
+        if self.workers <= 1:
+            counts = self.statistics(state, symbol, deadline, self.iterations)
+
+        else:
+            counts = {}
+
+            # multiprocessing is only imported when it is needed, since it is slow to import.
+            if self.pool is None:
+                import multiprocessing
+                self.pool = multiprocessing.Pool(self.workers)
+
+            # Every worker gets a share of the games, its own seed and the same deadline.
+            iterations = None if self.iterations is None else -(-self.iterations // self.workers)
+            seeds = [self.generator.getrandbits(32) for _ in range(self.workers)]
+            tasks = [(state, symbol, deadline, iterations, self.exploration, seed) for seed in seeds]
+
+            for result in self.pool.starmap(worker_statistics, tasks):
+
+                for square, (visits, wins) in result.items():
+                    total_visits, total_wins = counts.get(square, (0, 0.0))
+                    counts[square] = (total_visits + visits, total_wins + wins)
+
+        return max(counts, key=lambda square: counts[square][0]) + 1
+
+    # stop method makes the search running in this process return at its next check of the clock. It can be called
+    # from another thread.
+    def stop(self):
+        self.stopping = True
+
+    # close method stops the worker processes.
+    def close(self):
+
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool = None
+
+
+# worker_searcher is the MCTS used by this process when it is a worker, it keeps its tree between moves too.
+worker_searcher = None
+
+
+# worker_statistics function is run by a worker to search the position with its own tree and seed. It returns only the
+# visits and wins this search added, since the worker's tree may already hold the counts of an earlier task, even one
+# for the same move, which best_move has already added up or would add again.
+def worker_statistics(state, symbol, deadline, iterations, exploration, seed):
+    global worker_searcher
+
+    if worker_searcher is None:
+        worker_searcher = MCTS(None, None, 1, exploration)
+
+    worker_searcher.exploration = exploration
+    worker_searcher.generator.seed(seed)
+    root = worker_searcher.find_root(state, symbol)
+    before = {square: (child.visits, child.wins) for square, child in root.children.items()}
+    worker_searcher.search(root, deadline, iterations)
+    counts = {}
+
+    for square, child in root.children.items():
+        visits, wins = before.get(square, (0, 0.0))
+        counts[square] = (child.visits - visits, child.wins - wins)
+
+    return counts
+
+
+# searcher is shared by every mcts_move call in this process. Change its time_budget, iterations or workers to change
+# how long and how hard it thinks.
+searcher = MCTS()
+engine.SEARCHERS.append(searcher)
+
+
+# mcts_move strategy plays the move the shared searcher finds.
+def mcts_move(board, symbol):
+    return searcher.best_move(board, symbol)
+
+
+engine.STRATEGIES["mcts_move"] = mcts_move
@@ -0,0 +1,173 @@
+"""
+Project: Tic-Tac-Toe
+Description: Optional measurements of where the time goes; how long frames take to draw, how long it takes for a
+             click or mouse move to be painted, how long each robot strategy takes to decide, and how many games are
+             played a second along with the score. They are written to a text file every few seconds, from the
+             window's frames or after finished games in programs without one.
+             Nothing is measured unless enable is called. Every place that measures first checks that active isn't
+             None, so when it is turned off that check is all it costs.
+"""
+import bisect
+import os
+import threading
+import time
+
+# BUCKETS are the upper bounds in seconds of the histogram buckets, the last one catches everything else.
+BUCKETS = [0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, float("inf")]
+
+# active is the Metrics object being recorded to, or None when measuring is turned off.
+active = None
+
+
+# Histogram class counts how many times fell into each bucket, and keeps the total and the count.
+class Histogram:
+
+    # Initiates an empty histogram.
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    # observe method adds a time in seconds.
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+
+# Metrics class keeps every histogram and counter, and writes them to the file.
+class Metrics:
+
+    # Initiates the metrics. path is the file they are written to and interval is how many seconds between writes.
+    def __init__(self, path=None, interval=10.0):
+        self.path = path
+        self.interval = interval
+        self.histograms = {}
+        self.counters = {}
+        self.scoreboards = []
+        self.last_flush = time.monotonic()
+        self.last_games = 0
+        self.games_per_second = 0.0
+        # lock is held while the metrics are changed or read, since the robot decides on another thread than the one
+        # writing the file. It can be taken again by the thread holding it, so flush can call games and render.
+        self.lock = threading.RLock()
+
+    # observe method adds a time in seconds to the histogram with the name and label.
+    def observe(self, name, seconds, label=None):
+        key = (name, label)
+
+        with self.lock:
+            histogram = self.histograms.get(key)
+
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+
+            histogram.observe(seconds)
+
+    # increment method adds to the counter with the name and label.
+    def increment(self, name, amount=1, label=None):
+        key = (name, label)
+
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    # watch method adds a scoreboard, so its totals are written with the other metrics.
+    def watch(self, points):
+        self.scoreboards.append(points)
+
+    # games method returns how many games have been finished.
+    def games(self):
+
+        with self.lock:
+            return sum(value for (name, label), value in self.counters.items() if name == "games_total")
+
+    # snapshot method returns every metric in a dictionary, for reading them without the file.
+    def snapshot(self):
+
+        with self.lock:
+            return {"histograms": {key: (list(histogram.counts), histogram.total, histogram.count)
+                                   for key, histogram in self.histograms.items()},
+                    "counters": dict(self.counters),
+                    "games_per_second": self.games_per_second,
+                    "scores": [(points.x_score, points.o_score, points.draw) for points in self.scoreboards]}
+
+    # maybe_flush method writes the file if the interval has passed since it was last written.
+    def maybe_flush(self):
+
+        if time.monotonic() - self.last_flush >= self.interval:
+            self.flush()
+
+    # flush method works out the games a second since the last flush and writes every metric to the file.
+    def flush(self):
+
+        with self.lock:
+            now = time.monotonic()
+            games = self.games()
+
+            if now > self.last_flush:
+                self.games_per_second = (games - self.last_games) / (now - self.last_flush)
+
+            self.last_flush = now
+            self.last_games = games
+
+            if self.path is None:
+                return
+
+            # Writes to a temporary file first, so the file is never read half written.
+            temporary_path = f"{self.path}.tmp"
+
+            with open(temporary_path, "w") as file:
+                file.write(self.render())
+
+            os.replace(temporary_path, self.path)
+
+    # render method returns every metric as text, one value a line.
+    def render(self):
+
+        with self.lock:
+            lines = []
+
+            histograms = sorted(self.histograms.items(), key=lambda item: (item[0][0], str(item[0][1])))
+
+            for (name, label), histogram in histograms:
+                labels = "" if label is None else f'strategy="{label}",'
+                running_total = 0
+
+                for bound, count in zip(BUCKETS, histogram.counts):
+                    running_total += count
+                    bound_text = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    lines.append(f'{name}_bucket{{{labels}le="{bound_text}"}} {running_total}')
+
+                labels = "" if label is None else f'{{strategy="{label}"}}'
+                lines.append(f"{name}_sum{labels} {histogram.total:.6f}")
+                lines.append(f"{name}_count{labels} {histogram.count}")
+
+            for (name, label), value in sorted(self.counters.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+                labels = "" if label is None else f'{{result="{label}"}}'
+                lines.append(f"{name}{labels} {value}")
+
+            lines.append(f"games_per_second {self.games_per_second:.2f}")
+
+            for number, points in enumerate(self.scoreboards):
+                lines.append(f'scoreboard_x{{board="{number}"}} {points.x_score}')
+                lines.append(f'scoreboard_o{{board="{number}"}} {points.o_score}')
+                lines.append(f'scoreboard_draw{{board="{number}"}} {points.draw}')
+
+            return "\n".join(lines) + "\n"
+
+
+# enable function turns measuring on and returns the Metrics object being recorded to.
+def enable(path=None, interval=10.0):
+    global active
+    active = Metrics(path, interval)
+    return active
+
+
+# disable function writes the metrics one last time and turns measuring off.
+def disable():
+    global active
+
+    if active is not None:
+        active.flush()
+
+    active = None
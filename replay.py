@@ -0,0 +1,184 @@
+"""
+Project: Tic-Tac-Toe
+Description: Draws the games in a game log to PNG images without a window, with the same drawing code as the game.
+             Either every move of every game is saved as its own frame, or many games are put together on contact
+             sheets, a row for each game and a column for each move. Games are drawn by worker processes in batches,
+             each worker drawing every frame on the one surface it made when it started.
+Usage: python replay.py LOG OUTPUT [--sheets] [--games-per-sheet 20] [--limit N] [--workers N]
+"""
+import argparse
+import itertools
+import multiprocessing
+import os
+import time
+
+import gamelog
+import tic_tac_toe
+from engine import Board, Scoreboard
+
+BATCH_GAMES = 100
+GAMES_PER_SHEET = 20
+THUMBNAIL = 100
+
+# renderer is the Renderer of this process, made the first time it draws something.
+renderer = None
+
+
+# Renderer class draws positions of a game onto one offscreen surface with the game's BoardUI.
+class Renderer:
+
+    # Initiates the board and the UI that draws it. SDL is started with the dummy video driver so no window is opened,
+    # and the UI's screen is then just a surface in memory. SDL is kept from catching signals, otherwise the pool
+    # can't stop its workers.
+    def __init__(self, mode="rvr"):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ["SDL_NO_SIGNAL_HANDLERS"] = "1"
+        self.pygame = tic_tac_toe.load_pygame()
+        self.pygame.display.init()
+        self.pygame.font.init()
+        self.board = Board(Scoreboard(), verbose=False)
+        self.board.mode = mode
+        self.ui = tic_tac_toe.BoardUI(self.board, self.board.points)
+        self.sheet = None
+
+    # draw method draws the game after the first steps of its moves. The last position of a game shows its result
+    # in the score.
+    def draw(self, game, steps):
+        self.board.reset()
+        self.ui.points = Scoreboard()
+        symbol = game.first
+
+        for move in game.moves[:steps]:
+            self.board.place(move, symbol)
+            symbol = "o" if symbol == "x" else "x"
+
+        self.board.current_symbol = symbol
+
+        if steps == len(game.moves):
+            self.ui.points.add_score(game.result)
+
+        self.ui.load_symbols()
+        return self.ui.screen
+
+    # save_frames method saves every position of the game, from the empty board to the end, as frameNN.png in the
+    # directory.
+    def save_frames(self, game, directory):
+        os.makedirs(directory, exist_ok=True)
+
+        for steps in range(len(game.moves) + 1):
+            self.pygame.image.save(self.draw(game, steps), os.path.join(directory, f"frame{steps:02d}.png"))
+
+    # save_sheet method puts the games on one contact sheet, a row of thumbnails for every game, and saves it. The
+    # sheet is made once and used again for every sheet of the same size.
+    def save_sheet(self, games, path, rows):
+        size = (10 * THUMBNAIL, rows * THUMBNAIL)
+
+        if (self.sheet is None) or (self.sheet.get_size() != size):
+            self.sheet = self.pygame.Surface(size)
+
+        self.sheet.fill("dodgerblue4")
+
+        for row, game in enumerate(games):
+
+            for steps in range(len(game.moves) + 1):
+                thumbnail = self.pygame.transform.smoothscale(self.draw(game, steps), (THUMBNAIL, THUMBNAIL))
+                self.sheet.blit(thumbnail, (steps * THUMBNAIL, row * THUMBNAIL))
+
+        self.pygame.image.save(self.sheet, path)
+
+
+# render_batch function draws a batch of games in a worker. first is the number of the first game in the log. With
+# sheets the games are split into sheets of games_per_sheet, otherwise every game gets a directory of frames. Returns
+# how many images were saved.
+def render_batch(games, first, output, sheets, games_per_sheet):
+    global renderer
+
+    if renderer is None:
+        renderer = Renderer()
+
+    saved = 0
+
+    if sheets:
+
+        for start in range(0, len(games), games_per_sheet):
+            path = os.path.join(output, f"sheet{(first + start) // games_per_sheet:06d}.png")
+            renderer.save_sheet(games[start:start + games_per_sheet], path, games_per_sheet)
+            saved += 1
+
+    else:
+
+        for number, game in enumerate(games):
+            renderer.save_frames(game, os.path.join(output, f"game{first + number:07d}"))
+            saved += len(game.moves) + 1
+
+    return saved
+
+
+# run_render function lets a pool run render_batch with one argument.
+def run_render(task):
+    return render_batch(*task)
+
+
+# batches function reads the games from the log lazily and groups them into tasks for the workers.
+def batches(log_path, output, sheets, games_per_sheet, limit, batch_games):
+    games = gamelog.read_games(log_path)
+
+    if limit is not None:
+        games = itertools.islice(games, limit)
+
+    first = 0
+
+    while True:
+        batch = list(itertools.islice(games, batch_games))
+
+        if not batch:
+            return
+
+        yield batch, first, output, sheets, games_per_sheet
+        first += len(batch)
+
+
+# render_log function draws the games in the log into the output directory with workers processes and returns how many
+# images were saved. The size of a batch is rounded to whole sheets, so every sheet is drawn by one worker.
+def render_log(log_path, output, sheets=False, games_per_sheet=GAMES_PER_SHEET, limit=None, workers=None,
+               batch_games=BATCH_GAMES):
+    os.makedirs(output, exist_ok=True)
+
+    if sheets:
+        batch_games = max(1, batch_games // games_per_sheet) * games_per_sheet
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    tasks = batches(log_path, output, sheets, games_per_sheet, limit, batch_games)
+
+    # Runs in this process if there is only one worker, so there is no cost of starting a pool.
+    if workers <= 1:
+        return sum(map(run_render, tasks))
+
+    with multiprocessing.Pool(workers) as pool:
+        return sum(pool.imap_unordered(run_render, tasks))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Draws the games in a game log to PNG images.")
+    parser.add_argument("log", help="game log to draw")
+    parser.add_argument("output", help="directory the images are saved to")
+    parser.add_argument("--sheets", action="store_true", help="save contact sheets instead of every frame")
+    parser.add_argument("--games-per-sheet", type=int, default=GAMES_PER_SHEET, help="games on every contact sheet")
+    parser.add_argument("--limit", type=int, default=None, help="most games drawn from the start of the log")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    if args.games_per_sheet < 1:
+        parser.error("--games-per-sheet has to be at least 1")
+
+    start = time.perf_counter()
+    images = render_log(args.log, args.output, args.sheets, args.games_per_sheet, args.limit, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"{images} images saved to {args.output}")
+    print(f"{images / elapsed:.0f} images/sec")
+
+
+if __name__ == "__main__":
+    main()
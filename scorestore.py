@@ -0,0 +1,140 @@
+"""
+Project: Tic-Tac-Toe
+Description: Keeps the score in a file, so it isn't lost when the game is closed or crashes. Every result and score
+             reset is appended to a text file as a line with the time and the event ("x", "o", "d" or "reset").
+             Recording only adds the event to a queue, a background thread writes the queue in one go every
+             flush_interval seconds and makes sure it is on the disk (fsync) every fsync_interval seconds, so the
+             game never waits for the disk. The score since the last reset is loaded again when the game starts.
+Usage: python scorestore.py FILE
+"""
+import argparse
+import collections
+import os
+import threading
+import time
+
+# EVENTS are the events that can be recorded.
+EVENTS = {"x", "o", "d", "reset"}
+
+# FLUSH_INTERVAL is the seconds between writes and FSYNC_INTERVAL the seconds between making sure they are on the
+# disk, which is the most that can be lost if the computer loses power.
+FLUSH_INTERVAL = 1.0
+FSYNC_INTERVAL = 5.0
+
+
+# read_scores function reads the events in the file and returns the score since the last reset and the totals of every
+# game ever recorded, both as Counters of "x", "o" and "d". A line cut off by a crash is skipped.
+def read_scores(path):
+    current = collections.Counter()
+    totals = collections.Counter()
+
+    if not os.path.exists(path):
+        return current, totals
+
+    with open(path) as file:
+
+        for line in file:
+            words = line.split()
+
+            if (len(words) != 2) or (words[1] not in EVENTS) or (not line.endswith("\n")):
+                continue
+
+            if words[1] == "reset":
+                current.clear()
+
+            else:
+                current[words[1]] += 1
+                totals[words[1]] += 1
+
+    return current, totals
+
+
+# ScoreStore class appends the events to the file from a background thread. Set it as a Scoreboard's store to record
+# its results and resets.
+class ScoreStore:
+
+    # Initiates the store and starts the thread that writes to the file.
+    def __init__(self, path, flush_interval=FLUSH_INTERVAL, fsync_interval=FSYNC_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        # pending holds the lines that haven't been written yet. Adding to and taking from both ends of a deque is
+        # safe between threads, so the game never waits for a lock held by the writer.
+        self.pending = collections.deque()
+        self.file = open(path, "a")
+
+        # A line cut off by a crash is ended first, so the next event starts a line of its own.
+        if self.file.tell() > 0:
+
+            with open(path, "rb") as old_file:
+                old_file.seek(-1, os.SEEK_END)
+
+                if old_file.read(1) != b"\n":
+                    self.file.write("\n")
+
+        self.last_fsync = time.monotonic()
+        self.written = 0
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="scorestore", daemon=True)
+        self.thread.start()
+
+    # load method sets the scoreboard to the score saved since the last reset, starts recording its events and
+    # returns the totals of every game ever recorded.
+    def load(self, points):
+        current, totals = read_scores(self.path)
+        points.x_score, points.o_score, points.draw = current["x"], current["o"], current["d"]
+        points.store = self
+        return totals
+
+    # record method queues an event to be written. It never touches the file.
+    def record(self, event):
+        self.pending.append(f"{time.time():.3f} {event}\n")
+
+    # flush method writes every queued event at once, and makes sure they are on the disk if the fsync interval has
+    # passed or sync is True.
+    def flush(self, sync=False):
+        lines = []
+
+        while self.pending:
+            lines.append(self.pending.popleft())
+
+        if lines:
+            self.file.write("".join(lines))
+            self.file.flush()
+            self.written += len(lines)
+
+        if (sync or (time.monotonic() - self.last_fsync >= self.fsync_interval)) and (self.written > 0):
+            os.fsync(self.file.fileno())
+            self.last_fsync = time.monotonic()
+            self.written = 0
+
+    # run method is the background thread, it writes the queue every flush interval until the store is closed. It
+    # wakes up at least every fsync interval, so an fsync interval shorter than the flush interval is kept too.
+    def run(self):
+        interval = min(self.flush_interval, self.fsync_interval)
+
+        while not self.stopping.wait(interval):
+            self.flush()
+
+    # close method stops the thread and writes and syncs whatever is left.
+    def close(self):
+
+        if not self.file.closed:
+            self.stopping.set()
+            self.thread.join()
+            self.flush(sync=True)
+            self.file.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prints the scores kept in a score file.")
+    parser.add_argument("path", help="score file to read")
+    args = parser.parse_args()
+
+    current, totals = read_scores(args.path)
+    print(f"Current  x : {current['x']}  o : {current['o']}  d : {current['d']}")
+    print(f"Total    x : {totals['x']}  o : {totals['o']}  d : {totals['d']}  ({sum(totals.values())} games)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Project: Tic-Tac-Toe
+Description: A robot that plays perfectly. It searches every move with negamax and alpha-beta pruning and keeps the
+             positions it has already solved in a transposition table, so it never has to search them again.
+             Rotations and reflections of a board share the same table entry. Only works on the standard 3x3 board.
+"""
+from collections import OrderedDict
+
+import engine
+from engine import FULL_BOARD, WIN_MASKS
+
+# SEARCH_ORDER is the order the squares are tried in (center, corners then edges), good moves first means more pruning.
+SEARCH_ORDER = [4, 0, 2, 6, 8, 1, 3, 5, 7]
+
+# Flags saying if a stored value is exact or only a bound, because alpha-beta can stop searching a position early.
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+
+# symmetry_tables builds a table for each of the 8 rotations and reflections of the board, mapping every 9-bit
+# bitboard to the bitboard it becomes after that rotation or reflection.
+def symmetry_tables():
+    squares = list(range(9))
+    symmetries = []
+
+    for _ in range(4):
+        # Rotates the board a quarter turn, then also keeps its mirror image.
+        squares = [squares[(2 - (index % 3)) * 3 + (index // 3)] for index in range(9)]
+        symmetries.append(squares)
+        symmetries.append([squares[(index // 3) * 3 + 2 - (index % 3)] for index in range(9)])
+
+    tables = []
+
+    for symmetry in symmetries:
+        table = []
+
+        for bits in range(512):
+            moved = 0
+
+            for index in range(9):
+
+                if bits >> symmetry[index] & 1:
+                    moved |= 1 << index
+
+            table.append(moved)
+
+        tables.append(table)
+
+    return tables
+
+
+SYMMETRY_TABLES = symmetry_tables()
+
+
+# Searcher class finds the best move with negamax and keeps a bounded least recently used transposition table.
+class Searcher:
+
+    # Initiates the table. capacity is how many positions the table keeps before the oldest are thrown away.
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.table = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # key method returns the same key for a position and all of its rotations and reflections.
+    # me is the side to move, so the key doesn't need to know if that is x or o.
+    def key(self, me, them):
+        return min((table[me] << 9) | table[them] for table in SYMMETRY_TABLES)
+
+    # negamax method returns the value of the position for the side to move, them having just moved.
+    # A win is worth more the sooner it happens, a draw is worth 0.
+    def negamax(self, me, them, alpha, beta):
+        occupied = me | them
+
+        for mask, line in WIN_MASKS:
+
+            if them & mask == mask:
+                return -(10 - occupied.bit_count())
+
+        if occupied == FULL_BOARD:
+            return 0
+
+        key = self.key(me, them)
+        entry = self.table.get(key)
+        original_alpha = alpha
+
+        # Uses the stored value if the position has been searched before.
+        if entry is not None:
+            self.hits += 1
+            self.table.move_to_end(key)
+            value, flag = entry
+
+            if flag == EXACT:
+                return value
+
+            elif flag == LOWER:
+                alpha = max(alpha, value)
+
+            else:
+                beta = min(beta, value)
+
+            if alpha >= beta:
+                return value
+
+        else:
+            self.misses += 1
+
+        best = -10
+
+        for square in SEARCH_ORDER:
+            bit = 1 << square
+
+            if occupied & bit:
+                continue
+
+            value = -self.negamax(them, me | bit, -beta, -alpha)
+
+            if value > best:
+                best = value
+
+            if best > alpha:
+                alpha = best
+
+            if alpha >= beta:
+                break
+
+        # Stores the value, and if it is only a bound which kind, then throws away the oldest entry if it is full.
+        if best <= original_alpha:
+            flag = UPPER
+
+        elif best >= beta:
+            flag = LOWER
+
+        else:
+            flag = EXACT
+
+        self.table[key] = (best, flag)
+        self.table.move_to_end(key)
+
+        if len(self.table) > self.capacity:
+            self.table.popitem(last=False)
+            self.evictions += 1
+
+        return best
+
+    # best_move method returns the best square (1 to 9) for the symbol to play on the board.
+    def best_move(self, board, symbol):
+        me = board.bits[symbol]
+        them = board.bits[engine.opposite_symbol(symbol)]
+        occupied = me | them
+        best_move = 0
+        best = -11
+
+        for square in SEARCH_ORDER:
+            bit = 1 << square
+
+            if occupied & bit:
+                continue
+
+            value = -self.negamax(them, me | bit, -10, -best)
+
+            if value > best:
+                best = value
+                best_move = square + 1
+
+        return best_move
+
+    # stats method returns the table counters.
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self.table)}
+
+    # clear method empties the table and resets the counters.
+    def clear(self):
+        self.table.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+# searcher is shared by every perfect_move call in this process, so the table stays warm between moves and games.
+searcher = Searcher()
+
+
+# perfect_move strategy plays the best move using the shared searcher.
+def perfect_move(board, symbol):
+    return searcher.best_move(board, symbol)
+
+
+engine.STRATEGIES["perfect_move"] = perfect_move
@@ -0,0 +1,220 @@
+"""
+Project: Tic-Tac-Toe
+Description: Plays robot vs robot games and writes every position to memory-mapped numpy files, for training and
+             testing move models on hundreds of millions of positions.
+             Each position is one fixed size record: the board before the move (0 empty, 1 x, 2 o, like batch.py),
+             whose turn it was, the square played (0 based), the strategy that played it and the result of the game
+             (0 draw, 1 x, 2 o). The games are split into chunks, each written by one worker into a file made as big
+             as the chunk could ever need, which is cut down to the positions it holds and renamed once it is done.
+             Running the same command again skips the chunks that are already done, so a stopped run carries on.
+Usage: python selfplay.py DIRECTORY random_move intelligent_move --games 1000000 [--chunk-games 100000] [--workers N]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import time
+
+import numpy as np
+
+import engine
+import mcts  # Adds mcts_move to the strategies.
+import search  # Adds perfect_move to the strategies.
+import solved_table  # Adds table_move to the strategies.
+from engine import Board, Scoreboard
+
+# CODES are the numbers the symbols and results are stored as.
+CODES = {" ": 0, "x": 1, "o": 2, "d": 0}
+CHUNK_GAMES = 100000
+META_NAME = "meta.json"
+
+
+# record_dtype function returns the numpy type of one position on a board with that many squares.
+def record_dtype(size):
+    return np.dtype([("board", np.int8, (size,)), ("to_move", np.int8), ("move", np.int16), ("strategy", np.int8),
+                     ("result", np.int8)])
+
+
+# chunk_path function returns the path of the finished chunk.
+def chunk_path(directory, chunk):
+    return os.path.join(directory, f"chunk{chunk:06d}.bin")
+
+
+# write_chunk function plays the games of one chunk and writes their positions to its file, returning how many
+# positions it wrote. Each game's x and o strategies are picked at random from strategies. The chunk is seeded with
+# seed + chunk, so it comes out the same whichever worker plays it and however often the run is started again.
+def write_chunk(directory, chunk, games, strategies, seed, size, mcts_budget):
+    random.seed(seed + chunk)
+    mcts.searcher.generator.seed(seed + chunk)
+    mcts.searcher.time_budget, mcts.searcher.iterations = mcts_budget
+    functions = [engine.STRATEGIES[name] for name in strategies]
+    board = Board(Scoreboard(), verbose=False, rows=size[0], columns=size[1], k=size[2])
+    part_path = chunk_path(directory, chunk) + ".part"
+
+    # No game has more positions than squares, so the file can never run out of room.
+    records = np.memmap(part_path, dtype=record_dtype(board.size), mode="w+", shape=(games * board.size,))
+    row = 0
+
+    for _ in range(games):
+        players = {"x": random.randrange(len(functions)), "o": random.randrange(len(functions))}
+        cells = bytearray(board.size)
+        boards = bytearray()
+        to_move = bytearray()
+        moves = []
+
+        # A game's positions are gathered in small buffers and written with one numpy copy per field once it is over.
+        while True:
+            symbol = board.current_symbol
+            move = functions[players[symbol]](board, symbol)
+            boards += cells
+            to_move.append(CODES[symbol])
+            moves.append(move - 1)
+            cells[move - 1] = CODES[symbol]
+            board.new_move(move, symbol)
+
+            if board.total_moves == 0:
+                break
+
+        end = row + len(moves)
+        records["board"][row:end] = np.frombuffer(boards, dtype=np.int8).reshape(-1, board.size)
+        records["to_move"][row:end] = np.frombuffer(to_move, dtype=np.int8)
+        records["move"][row:end] = moves
+        records["strategy"][row:end] = np.where(np.frombuffer(to_move, dtype=np.int8) == 1, players["x"], players["o"])
+        records["result"][row:end] = CODES[board.last_result]
+        row = end
+
+    records.flush()
+    del records
+
+    # The file is cut down to the positions written and only then given its real name, so a chunk file that exists
+    # is always complete.
+    os.truncate(part_path, row * record_dtype(board.size).itemsize)
+    os.replace(part_path, chunk_path(directory, chunk))
+    return row
+
+
+# run_chunk function lets a pool run write_chunk with one argument.
+def run_chunk(task):
+    return task[1], write_chunk(*task)
+
+
+# generate function plays the games into the directory, using workers processes, and returns how many positions were
+# written and how many chunks were already done. The settings are kept in the directory, a run with different ones
+# than the ones already there raises ValueError instead of mixing the two.
+def generate(directory, strategies, games, chunk_games=CHUNK_GAMES, workers=None, seed=0, size=(3, 3, 3),
+             mcts_budget=(mcts.TIME_BUDGET, None), verbose=False):
+    os.makedirs(directory, exist_ok=True)
+    meta = {"rows": size[0], "columns": size[1], "k": size[2], "games": games, "chunk_games": chunk_games,
+            "strategies": list(strategies), "seed": seed}
+    meta_path = os.path.join(directory, META_NAME)
+
+    if os.path.exists(meta_path):
+
+        with open(meta_path) as file:
+            old_meta = json.load(file)
+
+        if old_meta != meta:
+            raise ValueError(f"{directory} holds a dataset made with other settings: {old_meta}")
+
+    else:
+
+        with open(meta_path, "w") as file:
+            json.dump(meta, file, indent=1)
+
+    chunks = -(-games // chunk_games)
+    tasks = [(directory, chunk, min(chunk_games, games - chunk * chunk_games), tuple(strategies), seed, size,
+              mcts_budget) for chunk in range(chunks) if not os.path.exists(chunk_path(directory, chunk))]
+    done = chunks - len(tasks)
+    positions = 0
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    workers = max(1, min(workers, len(tasks)))
+
+    # Runs in this process if there is only one worker, so there is no cost of starting a pool.
+    if workers == 1:
+        results = map(run_chunk, tasks)
+
+    else:
+        pool = multiprocessing.Pool(workers)
+        results = pool.imap_unordered(run_chunk, tasks)
+
+    try:
+
+        for chunk, written in results:
+            positions += written
+
+            if verbose:
+                print(f"chunk {chunk} done, {written} positions")
+
+    finally:
+
+        if workers > 1:
+            pool.terminate()
+
+    return positions, done
+
+
+# open_chunk function memory-maps a finished chunk for reading, an array of records of record_dtype.
+def open_chunk(path, size):
+    return np.memmap(path, dtype=record_dtype(size), mode="r")
+
+
+# read_dataset function yields every finished chunk of the dataset in order, memory-mapped so they are only read from
+# the disk when they are used.
+def read_dataset(directory):
+
+    with open(os.path.join(directory, META_NAME)) as file:
+        meta = json.load(file)
+
+    size = meta["rows"] * meta["columns"]
+
+    for chunk in range(-(-meta["games"] // meta["chunk_games"])):
+        path = chunk_path(directory, chunk)
+
+        if os.path.exists(path):
+            yield open_chunk(path, size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Writes robot vs robot positions to memory-mapped files.")
+    parser.add_argument("directory", help="directory the dataset is written to")
+    parser.add_argument("strategies", nargs="+", choices=engine.STRATEGIES, help="strategies x and o are picked from")
+    parser.add_argument("--games", type=int, default=100000, help="number of games to play")
+    parser.add_argument("--chunk-games", type=int, default=CHUNK_GAMES, help="games in every chunk file")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="seed given to the first chunk")
+    parser.add_argument("--rows", type=int, default=3, help="number of rows on the board")
+    parser.add_argument("--columns", type=int, default=3, help="number of columns on the board")
+    parser.add_argument("--k", type=int, default=3, help="how many in a row wins")
+    parser.add_argument("--mcts-time", type=float, default=mcts.TIME_BUDGET, help="seconds mcts_move thinks a move")
+    parser.add_argument("--mcts-iterations", type=int, default=None, help="most games mcts_move plays a move")
+    args = parser.parse_args()
+
+    if (args.games < 1) or (args.chunk_games < 1):
+        parser.error("--games and --chunk-games have to be at least 1")
+
+    error = engine.size_error(args.strategies, args.rows, args.columns, args.k)
+
+    if error is not None:
+        parser.error(error)
+
+    start = time.perf_counter()
+
+    try:
+        positions, done = generate(args.directory, args.strategies, args.games, args.chunk_games, args.workers,
+                                   args.seed, (args.rows, args.columns, args.k), (args.mcts_time, args.mcts_iterations),
+                                   verbose=True)
+
+    except ValueError as error:
+        parser.error(str(error))
+
+    elapsed = time.perf_counter() - start
+    print(f"{positions} positions written, {done} chunks were already done")
+    print(f"{positions / elapsed:.0f} positions/sec")
+
+
+if __name__ == "__main__":
+    main()
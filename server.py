@@ -0,0 +1,265 @@
+"""
+Project: Tic-Tac-Toe
+Description: Plays "pvr" games over the network, one game for every connection, with asyncio so one process can hold
+             thousands of them. Every connection has its own Board and Scoreboard, nothing is shared between them.
+             The protocol is one command a line and one reply a line:
+                 server: HELLO tic-tac-toe 3 3 3        (rows, columns, k)
+                 client: MOVE 5                         server: MOVED x 5
+                                                        server: MOVED o 1    (the robot's reply)
+                 when a game is over the server sends RESULT x, o or d, then SCORE x o d and the next game starts.
+                 client: BOARD                          server: BOARD x...o.... x    ('.' is empty, then the turn)
+                 client: SCORE                          server: SCORE 1 0 0
+                 client: NEW                            server: OK           (starts the game again, keeps the score)
+                 client: QUIT                           server: BYE
+             Anything else gets ERR and the reason. The player is x and the robot o, whoever's turn it is moves.
+             Robot strategies that take time are run in worker processes, so the event loop never waits for them.
+Usage: python server.py [--host 127.0.0.1] [--port 8765] [--unix PATH] [--robot intelligent_move] [--workers N]
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import multiprocessing
+
+import engine
+import mcts  # Adds mcts_move to the strategies.
+import search  # Adds perfect_move to the strategies.
+import solved_table  # Adds table_move to the strategies.
+from engine import Board, Scoreboard
+
+# INLINE_STRATEGIES take a few microseconds, so they are run straight away instead of in a worker process.
+INLINE_STRATEGIES = {"random_move", "intelligent_move"}
+
+# LIMIT is the longest line a client can send, and BACKLOG how many connections can wait to be accepted.
+LIMIT = 256
+BACKLOG = 4096
+
+
+# worker_move function is run in a worker process. It plays the game again from the squares played on a new board,
+# because the session's board can't be sent to another process, and returns the strategy's move.
+def worker_move(strategy, size, first, history):
+    board = Board(Scoreboard(), verbose=False, rows=size[0], columns=size[1], k=size[2])
+    board.current_symbol = first
+
+    for move in history:
+        board.new_move(move, board.current_symbol)
+
+    return engine.STRATEGIES[strategy](board, board.current_symbol)
+
+
+# Session class is one connection's game.
+class Session:
+
+    # Initiates the session with its own board and score. executor runs the robot moves that take time.
+    def __init__(self, reader, writer, robot, executor, size):
+        self.reader = reader
+        self.writer = writer
+        self.robot = robot
+        self.executor = executor
+        self.points = Scoreboard()
+        self.board = Board(self.points, verbose=False, rows=size[0], columns=size[1], k=size[2])
+        self.first = self.board.current_symbol
+        self.human_symbol = "x"
+        self.robot_symbol = "o"
+
+    # send method writes a reply line.
+    def send(self, line):
+        self.writer.write(f"{line}\n".encode())
+
+    # play method makes a move and sends it, followed by the result and score if it finished the game.
+    def play(self, move, symbol):
+        self.board.new_move(move, symbol)
+        self.send(f"MOVED {symbol} {move}")
+
+        if self.board.total_moves == 0:
+            self.send(f"RESULT {self.board.last_result}")
+            self.send(f"SCORE {self.points.x_score} {self.points.o_score} {self.points.draw}")
+            self.first = self.board.current_symbol
+
+    # robot_moves method lets the robot move for as long as it is its turn, which is also at the start of a game
+    # it begins.
+    async def robot_moves(self):
+
+        while self.board.current_symbol == self.robot_symbol:
+
+            if self.robot in INLINE_STRATEGIES:
+                move = engine.decide(self.robot, self.board, self.robot_symbol)
+
+            else:
+                size = (self.board.rows, self.board.columns, self.board.k)
+                move = await asyncio.get_running_loop().run_in_executor(
+                    self.executor, worker_move, self.robot, size, self.first, tuple(self.board.history))
+
+            self.play(move, self.robot_symbol)
+
+    # board_line method returns the board as one word, a character a square, and whose turn it is.
+    def board_line(self):
+        squares = "".join("." if spot == " " else spot for spot in self.board.get_moves())
+        return f"BOARD {squares} {self.board.current_symbol}"
+
+    # handle method answers one command and returns False if the connection should close.
+    async def handle(self, line):
+        words = line.split()
+
+        if not words:
+            self.send("ERR empty command")
+            return True
+
+        command = words[0].upper()
+
+        # Only MOVE takes a word after it.
+        if (command in ("BOARD", "SCORE", "NEW", "QUIT")) and (len(words) != 1):
+            self.send(f"ERR usage: {command}")
+            return True
+
+        match command:
+
+            case "MOVE":
+
+                # isdecimal is used since isdigit also passes characters like "²" that int can't read.
+                if (len(words) != 2) or (not words[1].isdecimal()):
+                    self.send("ERR usage: MOVE square")
+
+                elif self.board.current_symbol != self.human_symbol:
+                    self.send("ERR not your turn")
+
+                elif not self.board.is_legal(int(words[1])):
+                    self.send("ERR illegal move")
+
+                else:
+                    self.play(int(words[1]), self.human_symbol)
+                    await self.robot_moves()
+
+            case "BOARD":
+                self.send(self.board_line())
+
+            case "SCORE":
+                self.send(f"SCORE {self.points.x_score} {self.points.o_score} {self.points.draw}")
+
+            case "NEW":
+                self.board.reset()
+                self.first = self.board.current_symbol
+                self.send("OK")
+                await self.robot_moves()
+
+            case "QUIT":
+                self.send("BYE")
+                return False
+
+            case _:
+                self.send(f"ERR unknown command {words[0][:20]}")
+
+        return True
+
+    # run method greets the client and answers its commands until it quits or disconnects.
+    async def run(self):
+        self.send(f"HELLO tic-tac-toe {self.board.rows} {self.board.columns} {self.board.k}")
+
+        try:
+            await self.robot_moves()
+            await self.writer.drain()
+
+            while True:
+                line = await self.reader.readline()
+
+                if not line:
+                    break
+
+                if not await self.handle(line.decode(errors="replace")):
+                    break
+
+                await self.writer.drain()
+
+        except (ConnectionError, ValueError, asyncio.LimitOverrunError):
+            pass
+
+        finally:
+            self.writer.close()
+
+
+# Server class accepts the connections and gives each one a session.
+class Server:
+
+    # Initiates the server. workers is how many processes run the robot strategies that take time.
+    def __init__(self, robot="intelligent_move", workers=None, size=(3, 3, 3)):
+        self.robot = robot
+        self.size = size
+        self.executor = None
+
+        # The workers are spawned instead of forked, so they don't keep a copy of every open connection.
+        if robot not in INLINE_STRATEGIES:
+            context = multiprocessing.get_context("spawn")
+            self.executor = concurrent.futures.ProcessPoolExecutor(workers, mp_context=context)
+        self.sessions = 0
+        self.server = None
+
+    # connect method runs a session for a new connection.
+    async def connect(self, reader, writer):
+        self.sessions += 1
+
+        try:
+            await Session(reader, writer, self.robot, self.executor, self.size).run()
+
+        finally:
+            self.sessions -= 1
+
+    # start method starts listening on the TCP port, or on the Unix socket if path is given.
+    async def start(self, host="127.0.0.1", port=8765, path=None):
+
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self.connect, path, limit=LIMIT, backlog=BACKLOG)
+
+        else:
+            self.server = await asyncio.start_server(self.connect, host, port, limit=LIMIT, backlog=BACKLOG)
+
+        return self.server
+
+    # close method stops listening and shuts down the worker processes.
+    async def close(self):
+
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+
+async def serve(args):
+    server = Server(args.robot, args.workers, (args.rows, args.columns, args.k))
+    listener = await server.start(args.host, args.port, args.unix)
+    print(f"Listening on {args.unix or f'{args.host}:{args.port}'}")
+
+    try:
+        async with listener:
+            await listener.serve_forever()
+
+    finally:
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plays tic-tac-toe against the robot over the network.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port to listen on")
+    parser.add_argument("--unix", default=None, help="Unix socket to listen on instead of TCP")
+    parser.add_argument("--robot", choices=engine.STRATEGIES, default="intelligent_move", help="strategy of the robot")
+    parser.add_argument("--workers", type=int, default=None, help="processes for slow strategies (default: all cores)")
+    parser.add_argument("--rows", type=int, default=3, help="number of rows on the board")
+    parser.add_argument("--columns", type=int, default=3, help="number of columns on the board")
+    parser.add_argument("--k", type=int, default=3, help="how many in a row wins")
+    args = parser.parse_args()
+
+    error = engine.size_error([args.robot], args.rows, args.columns, args.k)
+
+    if error is not None:
+        parser.error(error)
+
+    try:
+        asyncio.run(serve(args))
+
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
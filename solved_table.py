@@ -0,0 +1,169 @@
+"""
+Project: Tic-Tac-Toe
+Description: Solves every tic-tac-toe position at once and stores the answers in a small binary file.
+             Each position has a base-3 index (0 empty, 1 x, 2 o, square 1 being the lowest digit), so the whole
+             board fits in 3 ** 9 = 19,683 entries. The robot memory-maps the file and plays with one lookup.
+             Solving needs numpy, reading the file does not. Only works on the standard 3x3 board.
+Usage: python solved_table.py [path]
+"""
+import mmap
+import os
+import struct
+import sys
+
+import engine
+from engine import WIN_MASKS
+
+SIZE = 3 ** 9
+MAGIC = b"TTT1"
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "solved_table.bin")
+
+# Every entry is 2 bytes: bits 0-3 are the best square (0 to 8, 15 if there isn't one), bits 4-7 the number of moves
+# until the game ends with best play, bits 8-9 the value for the side to move plus one (0 loss, 1 draw, 2 win) and
+# bit 10 is set if the position can happen in a real game.
+NO_MOVE = 15
+REACHABLE = 1 << 10
+
+# TERNARY maps a 9-bit bitboard to the base-3 index of those pieces, so an index is TERNARY[x] + 2 * TERNARY[o].
+TERNARY = [sum(3 ** square for square in range(9) if bits >> square & 1) for bits in range(512)]
+
+
+# solve function works out the value, best move and distance to the end for every position, one layer of positions
+# with the same number of pieces at a time, starting from the full boards. Returns the packed entries as a numpy array.
+def solve():
+    import numpy as np
+
+    powers = 3 ** np.arange(9)
+    indices = np.arange(SIZE)
+    cells = (indices[:, None] // powers) % 3
+    x_pieces = cells == 1
+    o_pieces = cells == 2
+    x_count = x_pieces.sum(axis=1)
+    o_count = o_pieces.sum(axis=1)
+    pieces = x_count + o_count
+
+    # lines holds the three squares of every winning line.
+    lines = np.array([[square for square in range(9) if mask >> square & 1] for mask, line in WIN_MASKS])
+    x_won = x_pieces[:, lines].all(axis=2).any(axis=1)
+    o_won = o_pieces[:, lines].all(axis=2).any(axis=1)
+
+    # x moves when both have the same number of pieces, which is the order every game in this table is played in.
+    x_to_move = x_count == o_count
+    valid = (x_to_move | (x_count == o_count + 1)) & ~(x_won & o_won)
+    terminal = x_won | o_won | (pieces == 9)
+    mover = np.where(x_to_move, 1, 2)
+    children = indices[:, None] + mover[:, None] * powers[None, :]
+    empty = cells == 0
+
+    value = np.zeros(SIZE, dtype=np.int64)
+    distance = np.zeros(SIZE, dtype=np.int64)
+    best = np.full(SIZE, NO_MOVE, dtype=np.int64)
+    value[np.where(x_to_move, o_won, x_won)] = -1
+
+    # Works backwards from the full boards, so every child is solved before its parent.
+    for layer in range(8, -1, -1):
+        selected = np.nonzero(valid & ~terminal & (pieces == layer))[0]
+        layer_children = np.where(empty[selected], children[selected], 0)
+        child_value = -value[layer_children]
+        child_distance = distance[layer_children] + 1
+
+        # Wins are better the sooner they happen and losses are better the later they happen.
+        score = np.where(child_value > 0, 100 - child_distance, np.where(child_value < 0, child_distance - 100, 0))
+        score = np.where(empty[selected], score, -1000)
+        choice = score.argmax(axis=1)
+        rows = np.arange(len(selected))
+        value[selected] = child_value[rows, choice]
+        distance[selected] = child_distance[rows, choice]
+        best[selected] = choice
+
+    # Works forwards from the empty board to find which positions can happen in a game.
+    reachable = np.zeros(SIZE, dtype=bool)
+    reachable[0] = True
+
+    for layer in range(9):
+        selected = np.nonzero(reachable & ~terminal & (pieces == layer))[0]
+        reachable[children[selected][empty[selected]]] = True
+
+    entries = best | (distance << 4) | ((value + 1) << 8)
+    return np.where(reachable, entries | REACHABLE, 0).astype("<u2")
+
+
+# write_table function solves the table and writes it to the path.
+def write_table(path=DEFAULT_PATH):
+    entries = solve()
+
+    # Writes to a temporary file first, so a worker never maps a half written table.
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+
+    with open(temporary_path, "wb") as file:
+        file.write(MAGIC)
+        file.write(entries.tobytes())
+
+    os.replace(temporary_path, path)
+
+
+# SolvedTable class reads the table file through a memory map, so every process using it shares the same pages.
+class SolvedTable:
+
+    # Opens and maps the table, solving it first if the file doesn't exist yet.
+    def __init__(self, path=DEFAULT_PATH):
+
+        if not os.path.exists(path):
+            write_table(path)
+
+        with open(path, "rb") as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self.map[:len(MAGIC)] != MAGIC or len(self.map) != len(MAGIC) + SIZE * 2:
+            raise ValueError(f"{path} is not a solved table")
+
+    # lookup method returns the value (-1 loss, 0 draw, 1 win for the side to move), the best square (1 to 9, 0 if
+    # the game is over) and how many moves are left with best play, for the position at the index.
+    def lookup(self, index):
+        entry = struct.unpack_from("<H", self.map, len(MAGIC) + index * 2)[0]
+
+        if not entry & REACHABLE:
+            raise ValueError(f"position {index} can't happen in a game")
+
+        best = entry & 15
+        return ((entry >> 8) & 3) - 1, 0 if best == NO_MOVE else best + 1, (entry >> 4) & 15
+
+    # index method returns the index of the board for the symbol to move. The table has x moving first, so if the
+    # symbol started this game the colours are swapped, which doesn't change who is winning.
+    def index(self, board, symbol):
+        me = board.bits[symbol]
+        them = board.bits[engine.opposite_symbol(symbol)]
+
+        if me.bit_count() == them.bit_count():
+            return TERNARY[me] + 2 * TERNARY[them]
+
+        return TERNARY[them] + 2 * TERNARY[me]
+
+    # best_move method returns the best square (1 to 9) for the symbol to play on the board.
+    def best_move(self, board, symbol):
+        return self.lookup(self.index(board, symbol))[1]
+
+    # close method unmaps the file.
+    def close(self):
+        self.map.close()
+
+
+# table is opened the first time table_move is used, so importing this module costs nothing.
+table = None
+
+
+# table_move strategy plays the best move from the solved table.
+def table_move(board, symbol):
+    global table
+
+    if table is None:
+        table = SolvedTable()
+
+    return table.best_move(board, symbol)
+
+
+engine.STRATEGIES["table_move"] = table_move
+
+
+if __name__ == "__main__":
+    write_table(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH)
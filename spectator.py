@@ -0,0 +1,247 @@
+"""
+Project: Tic-Tac-Toe
+Description: Watches many "rvr" games at once, each on its own small board in a grid that fills one window.
+             The games are played by the engine as fast as it can in part of every frame, not at the speed of the
+             window, and the window is drawn in one pass: the empty boards are drawn once to a background, and every
+             frame only the boards whose pieces have changed are drawn again on top of it, then the window is updated
+             once. The window is sized with the same offset as the game's.
+Usage: python spectator.py intelligent_move random_move [--games 100] [--fps 60] [--moves-per-second N]
+       [--mcts-time SECONDS]
+"""
+import argparse
+import math
+import time
+
+import engine
+import mcts  # Adds mcts_move to the strategies.
+import search  # Adds perfect_move to the strategies.
+import solved_table  # Adds table_move to the strategies.
+import tic_tac_toe
+from engine import Board, Scoreboard
+
+# LOGIC_SHARE is the part of every frame the games can be played in, the rest is left for drawing.
+LOGIC_SHARE = 0.5
+
+# GAP is the pixels between the boards.
+GAP = 2
+
+
+# SpectatorGrid class plays the games and draws them in a grid.
+class SpectatorGrid:
+
+    # Initiates the games and works out the grid. moves_per_second is how many moves every game makes a second, or
+    # None to play them as fast as the engine can.
+    def __init__(self, x_strategy, o_strategy, games=100, rows=3, columns=3, k=3, fps=60, moves_per_second=None):
+        self.pygame = tic_tac_toe.load_pygame()
+        self.strategies = {"x": engine.STRATEGIES[x_strategy], "o": engine.STRATEGIES[o_strategy]}
+        self.names = (x_strategy, o_strategy)
+        self.points = Scoreboard()
+        self.boards = [Board(self.points, verbose=False, rows=rows, columns=columns, k=k) for _ in range(games)]
+        self.fps = fps
+        self.moves_per_second = moves_per_second
+        self.moves_owed = 0.0
+        self.next_board = 0
+        self.moves_played = 0
+
+        # The window is the size the game's would be, and the boards are laid out in a square grid inside it.
+        offset = 1000 // max(1, self.pygame.display.Info().current_h) + 1
+        size = int(1000 / offset)
+        self.screen = self.pygame.display.set_mode([size, size])
+        self.grid_columns = math.ceil(math.sqrt(games))
+        self.tile = size // self.grid_columns
+
+        # layout is the game's layout for one board the size of a tile, so the symbols look the same as in the game.
+        self.layout = tic_tac_toe.Layout(self.boards[0], 900 / (self.tile - GAP))
+        self.tiles = [self.pygame.Rect((number % self.grid_columns) * self.tile, (number // self.grid_columns) * self.tile,
+                                       self.tile, self.tile) for number in range(games)]
+        self.cells = [self.pygame.Rect([round(value) for value in self.layout.rects[square]])
+                      for square in range(self.boards[0].size)]
+        self.build_background()
+        self.build_symbols()
+
+        # drawn keeps the hash of the pieces every board had when it was last drawn, None if it hasn't been drawn.
+        self.drawn = [None] * games
+
+    # build_background method draws every empty board once to the background.
+    def build_background(self):
+        self.background = self.pygame.Surface(self.screen.get_size())
+        self.background.fill("dodgerblue4")
+        line_width = max(1, round(5 * self.layout.cell / 300))
+        board_lines = self.layout.lines[:(self.layout.columns - 1) + (self.layout.rows - 1)]
+
+        for tile in self.tiles:
+            board_rect = (tile.left, tile.top, self.layout.board_width, self.layout.board_height)
+            self.pygame.draw.rect(self.background, "dodgerblue", board_rect)
+
+            for colour, start, end in board_lines:
+                self.pygame.draw.line(self.background, colour, (tile.left + start[0], tile.top + start[1]),
+                                      (tile.left + end[0], tile.top + end[1]), line_width)
+
+    # build_symbols method draws x and o once on their own square surfaces, so placing one is a single blit. They
+    # are drawn the way BoardUI.draw_symbol draws them on the first square.
+    def build_symbols(self):
+        layout = self.layout
+        self.symbols = {}
+
+        for symbol in ("x", "o"):
+            surface = self.pygame.Surface(self.cells[0].size)
+            surface.fill("black")
+            surface.set_colorkey("black")
+
+            if symbol == "x":
+                start, end, other_start, other_end = layout.cross_lines[0]
+                self.pygame.draw.line(surface, "orange", start, end, layout.cross_width)
+                self.pygame.draw.line(surface, "orange", other_start, other_end, layout.cross_width)
+
+            else:
+                self.pygame.draw.circle(surface, "hotpink2", layout.circle_centres[0], max(1, layout.outer_radius))
+                self.pygame.draw.circle(surface, "dodgerblue1", layout.circle_centres[0], layout.inner_radius)
+
+            self.symbols[symbol] = surface
+
+    # play method makes moves on the boards in turn until it has made the moves it owes or the deadline is reached.
+    # The clock is checked after every move, since a search robot's move can take longer than a whole frame. A
+    # finished game starts again by itself, like the game's board does.
+    def play(self, moves, deadline):
+        boards = self.boards
+        strategies = self.strategies
+        played = 0
+
+        while played < moves:
+            board = boards[self.next_board]
+            self.next_board = (self.next_board + 1) % len(boards)
+            symbol = board.current_symbol
+            board.new_move(strategies[symbol](board, symbol), symbol)
+            played += 1
+
+            if time.perf_counter() >= deadline:
+                break
+
+        self.moves_played += played
+        return played
+
+    # advance method plays the games for this frame. At engine speed that is as many moves as fit in the frame's
+    # share of time, otherwise the moves owed since the last frame.
+    def advance(self, elapsed):
+        deadline = time.perf_counter() + LOGIC_SHARE / self.fps
+
+        if self.moves_per_second is None:
+            self.play(math.inf, deadline)
+            return
+
+        self.moves_owed += elapsed * self.moves_per_second * len(self.boards)
+        self.moves_owed -= self.play(int(self.moves_owed), deadline)
+
+        # Moves that didn't fit in the time aren't kept owing, so a slow robot doesn't build up a backlog.
+        self.moves_owed = min(self.moves_owed, len(self.boards))
+
+    # draw method draws every board that has changed since it was last drawn, in one batch of blits, and updates the
+    # window once for all of them.
+    def draw(self):
+        blits = []
+        dirty = []
+
+        for number, board in enumerate(self.boards):
+
+            if self.drawn[number] == board.hash:
+                continue
+
+            self.drawn[number] = board.hash
+            tile = self.tiles[number]
+            blits.append((self.background, tile, tile))
+
+            for square, spot in enumerate(board.moves):
+
+                if spot != " ":
+                    blits.append((self.symbols[spot], self.cells[square].move(tile.left, tile.top)))
+
+            dirty.append(tile)
+
+        if blits:
+            self.screen.blits(blits, doreturn=False)
+            self.pygame.display.update(dirty)
+
+        return len(dirty)
+
+    # run method is the main loop, done until the window is closed or the seconds are up. Returns the frames drawn.
+    def run(self, seconds=None):
+        clock = self.pygame.time.Clock()
+        self.screen.blit(self.background, (0, 0))
+        self.pygame.display.flip()
+        start = time.perf_counter()
+        last_frame = start
+        last_caption = start
+        frames = 0
+
+        while (seconds is None) or (time.perf_counter() - start < seconds):
+
+            for event in self.pygame.event.get():
+
+                if (event.type == self.pygame.QUIT) or ((event.type == self.pygame.KEYDOWN) and
+                                                        (event.key == self.pygame.K_ESCAPE)):
+                    return frames
+
+            now = time.perf_counter()
+            self.advance(now - last_frame)
+            last_frame = now
+            self.draw()
+            frames += 1
+
+            # The score of every game together and the speed are shown in the title once a second.
+            if now - last_caption >= 1:
+                self.pygame.display.set_caption(
+                    f"{self.names[0]} vs {self.names[1]}  x : {self.points.x_score}  o : {self.points.o_score}  "
+                    f"d : {self.points.draw}  {clock.get_fps():.0f} fps  "
+                    f"{self.moves_played / (now - last_caption):.0f} moves/sec")
+                self.moves_played = 0
+                last_caption = now
+
+            clock.tick(self.fps)
+
+        return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watches many robot vs robot games at once.")
+    parser.add_argument("x_strategy", choices=engine.STRATEGIES, help="strategy used by the x robots")
+    parser.add_argument("o_strategy", choices=engine.STRATEGIES, help="strategy used by the o robots")
+    parser.add_argument("--games", type=int, default=100, help="number of games shown at once")
+    parser.add_argument("--fps", type=int, default=60, help="most frames drawn a second")
+    parser.add_argument("--moves-per-second", type=float, default=None,
+                        help="moves every game makes a second (default: as fast as the engine can)")
+    parser.add_argument("--mcts-time", type=float, default=None,
+                        help="seconds mcts_move thinks a move (default: what fits in the frame)")
+    parser.add_argument("--seconds", type=float, default=None, help="stop after this many seconds")
+    parser.add_argument("--rows", type=int, default=3, help="number of rows on the board")
+    parser.add_argument("--columns", type=int, default=3, help="number of columns on the board")
+    parser.add_argument("--k", type=int, default=3, help="how many in a row wins")
+    args = parser.parse_args()
+
+    if args.games < 1:
+        parser.error("--games has to be at least 1")
+
+    error = engine.size_error([args.x_strategy, args.o_strategy], args.rows, args.columns, args.k)
+
+    if error is not None:
+        parser.error(error)
+
+    # mcts_move is given no more than the frame's share of time for playing, so it can't hold up the window.
+    mcts.searcher.time_budget = LOGIC_SHARE / args.fps if args.mcts_time is None else args.mcts_time
+
+    pygame = tic_tac_toe.load_pygame()
+    pygame.init()
+    pygame.display.set_caption("Tic-Tac-Toe")
+    grid = SpectatorGrid(args.x_strategy, args.o_strategy, args.games, args.rows, args.columns, args.k, args.fps,
+                         args.moves_per_second)
+    start = time.perf_counter()
+    frames = grid.run(args.seconds)
+    elapsed = time.perf_counter() - start
+    print(f"{grid.points.total_games()} games, x : {grid.points.x_score}  o : {grid.points.o_score}  "
+          f"d : {grid.points.draw}")
+    print(f"{frames / elapsed:.1f} frames/sec")
+    mcts.searcher.close()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Project: Tic-Tac-Toe
+Description: The slow and obvious versions of what the engine works out quickly, for the tests to check it against.
+             Nothing here uses the engine's line tables, bitboards or caches, every answer is found by looking at
+             every square of the board again.
+"""
+import functools
+
+from engine import Board, Scoreboard
+
+
+# winner function returns the symbol with k in a row on the board (a list of " ", "x" and "o", row by row), or None.
+# Every square is tried as the start of a line going right, down and along both diagonals.
+def winner(cells, rows=3, columns=3, k=3):
+
+    for row in range(rows):
+
+        for column in range(columns):
+            symbol = cells[row * columns + column]
+
+            if symbol == " ":
+                continue
+
+            for row_step, column_step in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_row = row + row_step * (k - 1)
+                end_column = column + column_step * (k - 1)
+
+                if not ((0 <= end_row < rows) and (0 <= end_column < columns)):
+                    continue
+
+                if all(cells[(row + row_step * step) * columns + column + column_step * step] == symbol
+                       for step in range(k)):
+                    return symbol
+
+    return None
+
+
+# winning_squares function returns every empty square (1 to the size of the board) that would win for the symbol. The
+# pieces in a row through each empty square are counted by walking out from it both ways in every direction.
+def winning_squares(cells, symbol, rows=3, columns=3, k=3):
+    squares = set()
+
+    for square, spot in enumerate(cells):
+
+        if spot != " ":
+            continue
+
+        row, column = divmod(square, columns)
+
+        for row_step, column_step in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            in_a_row = 1
+
+            for direction in (1, -1):
+                step = 1
+
+                while True:
+                    next_row = row + row_step * step * direction
+                    next_column = column + column_step * step * direction
+
+                    if not ((0 <= next_row < rows) and (0 <= next_column < columns)):
+                        break
+
+                    if cells[next_row * columns + next_column] != symbol:
+                        break
+
+                    in_a_row += 1
+                    step += 1
+
+            if in_a_row >= k:
+                squares.add(square + 1)
+
+    return squares
+
+
+# value function returns how the game on the 3x3 board ends with best play, for the symbol to move: 1 a win, 0 a
+# draw and -1 a loss. cells is a tuple so the answers can be cached.
+@functools.lru_cache(maxsize=None)
+def value(cells, symbol):
+    other = "o" if symbol == "x" else "x"
+
+    if winner(cells) == other:
+        return -1
+
+    if " " not in cells:
+        return 0
+
+    return max(-value(cells[:square] + (symbol,) + cells[square + 1:], other)
+               for square in range(9) if cells[square] == " ")
+
+
+# reachable_positions function returns every position on the 3x3 board that can come up in a game x starts and isn't
+# over yet, as a tuple of the cells and the symbol to move.
+def reachable_positions():
+    positions = []
+    seen = set()
+    stack = [((" ",) * 9, "x")]
+
+    while stack:
+        cells, symbol = stack.pop()
+
+        if (cells in seen) or (winner(cells) is not None) or (" " not in cells):
+            continue
+
+        seen.add(cells)
+        positions.append((cells, symbol))
+        other = "o" if symbol == "x" else "x"
+
+        for square in range(9):
+
+            if cells[square] == " ":
+                stack.append((cells[:square] + (symbol,) + cells[square + 1:], other))
+
+    return positions
+
+
+# make_board function returns a quiet Board with the pieces of the cells on it and the symbol to move.
+def make_board(cells, symbol, bitboard=True):
+    board = Board(Scoreboard(), bitboard, False)
+
+    for square, spot in enumerate(cells):
+
+        if spot != " ":
+            board.place(square + 1, spot)
+
+    board.current_symbol = symbol
+    return board
@@ -0,0 +1,9 @@
+"""
+Project: Tic-Tac-Toe
+Description: Lets the tests import the game's modules, which sit in the folder above this one.
+Usage: python -m pytest -q
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,192 @@
+"""
+Project: Tic-Tac-Toe
+Description: Plays random games on boards of many sizes, with and without the bitboard, and checks every move against
+             the brute-force versions: that the board finds every win and draw, that one_off_win and
+             intelligent_move find the squares that win or block, that the line counts and threats are right, and
+             that undo and redo leave the board and its hash the same as playing the moves again.
+Usage: python -m pytest -q tests/test_board.py
+"""
+import random
+
+import pytest
+
+import brute_force
+import engine
+from engine import Board, Scoreboard
+
+# SIZES are the rows, columns and k of the boards the games are played on, from the standard board to gomoku, and
+# how many games are played on each. The big boards get fewer, since the brute-force check rescans the whole board.
+SIZES = [(3, 3, 3, 300), (4, 4, 3, 200), (4, 4, 4, 200), (3, 5, 3, 200), (5, 3, 3, 200), (6, 7, 4, 100),
+         (1, 5, 3, 100), (7, 7, 5, 50), (15, 15, 5, 5)]
+
+
+# The board has to give the result the brute-force check finds after every move, and nothing before the game is over.
+@pytest.mark.parametrize("bitboard", [True, False])
+@pytest.mark.parametrize("size", SIZES)
+def test_win_detection(size, bitboard):
+    rows, columns, k, games = size
+    generator = random.Random(f"{size} {bitboard}")
+    points = Scoreboard()
+    board = Board(points, bitboard, False, rows, columns, k)
+
+    for _ in range(games):
+
+        while True:
+            symbol = board.current_symbol
+            move = generator.choice(board.possible_moves)
+            cells = list(board.moves)
+            cells[move - 1] = symbol
+            expected = brute_force.winner(cells, rows, columns, k)
+
+            if (expected is None) and (" " not in cells):
+                expected = "d"
+
+            games = points.total_games()
+            board.new_move(move, symbol)
+
+            if expected is None:
+                assert (board.moves == cells) and (points.total_games() == games)
+                assert board.current_symbol != symbol
+                continue
+
+            assert board.last_result == expected
+            assert points.total_games() == games + 1
+            assert (board.total_moves == 0) and (board.moves == [" "] * board.size)
+            break
+
+
+# random_positions function plays seeded random games on the board and yields it after every move of a game that
+# isn't over, until the games are played.
+def random_positions(board, games, seed):
+    generator = random.Random(seed)
+
+    for _ in range(games):
+
+        while True:
+            board.new_move(generator.choice(board.possible_moves), board.current_symbol)
+
+            if board.total_moves == 0:
+                break
+
+            yield board
+
+
+# one_off_win has to find a square that wins for the symbol whenever there is one, and 0 when there isn't.
+@pytest.mark.parametrize("bitboard", [True, False])
+@pytest.mark.parametrize("size", SIZES)
+def test_one_off_win(size, bitboard):
+    rows, columns, k, games = size
+    board = Board(Scoreboard(), bitboard, False, rows, columns, k)
+
+    for board in random_positions(board, games, f"{size} {bitboard}"):
+
+        for symbol in ("x", "o"):
+            squares = brute_force.winning_squares(list(board.moves), symbol, rows, columns, k)
+            move = engine.one_off_win(board, symbol)
+            assert (move in squares) if squares else (move == 0), (board.moves, symbol, move)
+
+
+# The line counts and threats kept move by move have to be the same as counting every line again.
+@pytest.mark.parametrize("size", SIZES)
+def test_line_counts_and_threats(size):
+    rows, columns, k, games = size
+    board = Board(Scoreboard(), True, False, rows, columns, k)
+
+    for board in random_positions(board, games, f"{size} lines"):
+
+        for symbol in ("x", "o"):
+            other = engine.opposite_symbol(symbol)
+            counts = [sum(board.moves[square] == symbol for square in line) for line in board.lines]
+            other_counts = [sum(board.moves[square] == other for square in line) for line in board.lines]
+            assert board.line_counts[symbol] == counts
+            assert board.threats[symbol] == {line for line in range(len(board.lines))
+                                             if (counts[line] == k - 1) and (other_counts[line] == 0)}
+
+
+# intelligent_move takes the centre first, then a win, then a block, and otherwise any square that is empty.
+@pytest.mark.parametrize("bitboard", [True, False])
+@pytest.mark.parametrize("size", SIZES)
+def test_intelligent_move(size, bitboard):
+    rows, columns, k, games = size
+    board = Board(Scoreboard(), bitboard, False, rows, columns, k)
+
+    for board in random_positions(board, games, f"{size} {bitboard} intelligent"):
+        symbol = board.current_symbol
+        move = engine.intelligent_move(board, symbol)
+        wins = brute_force.winning_squares(list(board.moves), symbol, rows, columns, k)
+        blocks = brute_force.winning_squares(list(board.moves), engine.opposite_symbol(symbol), rows, columns, k)
+        assert board.moves[move - 1] == " "
+
+        if board.is_legal(board.center()):
+            assert move == board.center()
+
+        elif wins:
+            assert move in wins
+
+        elif blocks:
+            assert move in blocks
+
+
+# replayed function returns a new board with the moves of the board's game placed on it in order, which is what undo
+# and redo have to leave the board the same as.
+def replayed(board):
+    fresh = Board(Scoreboard(), board.bitboard, False, board.rows, board.columns, board.k)
+
+    for move in board.history:
+        fresh.place(move, board.moves[move - 1])
+
+    return fresh
+
+
+# Random moves, undos and redos have to leave the board as if only the moves still played had been made, with the
+# same hash as working it out from the pieces again.
+@pytest.mark.parametrize("bitboard", [True, False])
+@pytest.mark.parametrize("size", SIZES)
+def test_undo_redo(size, bitboard):
+    rows, columns, k, games = size
+    generator = random.Random(f"{size} {bitboard} undo")
+    board = Board(Scoreboard(), bitboard, False, rows, columns, k)
+    keys = engine.zobrist_keys(board.size)
+    undone = []
+
+    for _ in range(games * board.size):
+        action = generator.random()
+
+        if action < 0.3:
+            move = board.undo()
+
+            # Nothing is taken back only if no move of this game is left on the board.
+            if move == 0:
+                assert not board.history
+
+            else:
+                undone.append(move)
+
+        elif (action < 0.5) and board.redo_moves:
+            assert board.redo() == undone.pop()
+
+        else:
+            board.new_move(generator.choice(board.possible_moves), board.current_symbol)
+            undone = []
+
+            if board.total_moves == 0:
+                assert not board.redo_moves
+                continue
+
+        fresh = replayed(board)
+        assert (board.moves, board.bits, board.possible_moves) == (fresh.moves, fresh.bits, fresh.possible_moves)
+        assert (board.line_counts, board.threats) == (fresh.line_counts, fresh.threats)
+        assert board.total_moves == len(board.history)
+        assert board.hash == fresh.hash
+        pieces_hash = 0
+
+        for square, spot in enumerate(board.moves):
+
+            if spot != " ":
+                pieces_hash ^= keys[spot][square]
+
+        assert board.hash == pieces_hash
+
+        # It is always the turn of whoever didn't play the last move still on the board.
+        if board.history:
+            assert board.current_symbol == engine.opposite_symbol(board.moves[board.history[-1] - 1])
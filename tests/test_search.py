@@ -0,0 +1,49 @@
+"""
+Project: Tic-Tac-Toe
+Description: Checks perfect_move against a plain minimax on every position that can come up in a game.
+Usage: python -m pytest -q tests/test_search.py
+"""
+import brute_force
+import search
+
+
+# There are 4520 positions in games x starts that aren't over yet.
+def test_reachable_positions():
+    assert len(brute_force.reachable_positions()) == 4520
+
+
+# perfect_move has to keep the best result the position has, a win stays a win and a draw a draw.
+def test_perfect_move_keeps_the_value():
+    searcher = search.Searcher()
+
+    for cells, symbol in brute_force.reachable_positions():
+        board = brute_force.make_board(cells, symbol)
+        move = searcher.best_move(board, symbol)
+        other = "o" if symbol == "x" else "x"
+        assert cells[move - 1] == " "
+        assert -brute_force.value(cells[:move - 1] + (symbol,) + cells[move:], other) == \
+            brute_force.value(cells, symbol), (cells, symbol, move)
+
+
+# A table too small to hold the search still has to find the best moves, it is only slower.
+def test_perfect_move_with_a_small_table():
+    searcher = search.Searcher(capacity=16)
+
+    for cells, symbol in brute_force.reachable_positions()[::7]:
+        move = searcher.best_move(brute_force.make_board(cells, symbol), symbol)
+        other = "o" if symbol == "x" else "x"
+        assert -brute_force.value(cells[:move - 1] + (symbol,) + cells[move:], other) == \
+            brute_force.value(cells, symbol), (cells, symbol, move)
+
+    assert searcher.stats()["evictions"] > 0
+
+
+# The same position played by o must get the same square, since only the colours are swapped.
+def test_perfect_move_for_both_colours():
+    searcher = search.Searcher()
+
+    for cells, symbol in brute_force.reachable_positions()[::5]:
+        swapped = tuple({"x": "o", "o": "x", " ": " "}[spot] for spot in cells)
+        other = "o" if symbol == "x" else "x"
+        assert searcher.best_move(brute_force.make_board(cells, symbol), symbol) == \
+            searcher.best_move(brute_force.make_board(swapped, other), other)
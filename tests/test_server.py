@@ -0,0 +1,154 @@
+"""
+Project: Tic-Tac-Toe
+Description: Talks to the server over a localhost connection the way a client would, checking the reply to every
+             command, the replies to broken commands and that a whole game ends with its result and score.
+Usage: python -m pytest -q tests/test_server.py
+"""
+import asyncio
+
+import server
+
+
+# Client class is one connection to the server, sending a command a line and reading the replies.
+class Client:
+
+    # Initiates the client on an open connection.
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    # send method sends a line and returns the next reply line.
+    async def send(self, line):
+        self.writer.write(f"{line}\n".encode())
+        await self.writer.drain()
+        return await self.reply()
+
+    # reply method returns the next line from the server, or "" once it has closed the connection.
+    async def reply(self):
+        return (await asyncio.wait_for(self.reader.readline(), 5)).decode().rstrip("\n")
+
+    # close method closes the connection.
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+# run_session function starts a server on a free localhost port, connects a client to it and runs the check with it.
+def run_session(check):
+
+    async def session():
+        game_server = server.Server("intelligent_move")
+        listener = await game_server.start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        client = Client(reader, writer)
+
+        try:
+            assert await client.reply() == "HELLO tic-tac-toe 3 3 3"
+            await check(client)
+
+        finally:
+            await client.close()
+            await game_server.close()
+
+    asyncio.run(session())
+
+
+# The robot takes the centre after the player's first move, since intelligent_move always does when it can.
+def test_move_and_board():
+
+    async def check(client):
+        assert await client.send("MOVE 1") == "MOVED x 1"
+        assert await client.reply() == "MOVED o 5"
+        assert await client.send("BOARD") == "BOARD x...o.... x"
+        assert await client.send("score") == "SCORE 0 0 0"
+
+    run_session(check)
+
+
+def test_malformed_move():
+
+    async def check(client):
+
+        for line in ("MOVE", "MOVE 1 2", "MOVE x", "MOVE -1", "MOVE 1.5", "MOVE ²", "MOVE ½"):
+            assert await client.send(line) == "ERR usage: MOVE square"
+
+        assert await client.send("MOVE 0") == "ERR illegal move"
+        assert await client.send("MOVE 10") == "ERR illegal move"
+        assert await client.send("MOVE 1") == "MOVED x 1"
+        assert await client.reply() == "MOVED o 5"
+        assert await client.send("MOVE 5") == "ERR illegal move"
+
+        # The connection still works after the broken commands.
+        assert await client.send("BOARD") == "BOARD x...o.... x"
+
+    run_session(check)
+
+
+def test_malformed_board_and_new():
+
+    async def check(client):
+        assert await client.send("MOVE 1") == "MOVED x 1"
+        assert await client.reply() == "MOVED o 5"
+        assert await client.send("BOARD 1") == "ERR usage: BOARD"
+        assert await client.send("NEW game") == "ERR usage: NEW"
+        assert await client.send("SCORE x") == "ERR usage: SCORE"
+        assert await client.send("QUIT now") == "ERR usage: QUIT"
+
+        # None of them changed the game.
+        assert await client.send("BOARD") == "BOARD x...o.... x"
+        assert await client.send("NEW") == "OK"
+        assert await client.send("BOARD") == "BOARD ......... x"
+
+    run_session(check)
+
+
+def test_unknown_and_empty_commands():
+
+    async def check(client):
+        assert await client.send("") == "ERR empty command"
+        assert await client.send("   ") == "ERR empty command"
+        assert await client.send("JUMP 3") == "ERR unknown command JUMP"
+        assert await client.send("QUIT") == "BYE"
+        assert await client.reply() == ""
+
+    run_session(check)
+
+
+# A line longer than the limit closes the connection instead of being read.
+def test_long_line_closes():
+
+    async def check(client):
+        assert await client.send("MOVE " + "1" * server.LIMIT) == ""
+
+    run_session(check)
+
+
+# Plays the first empty square until the game is over, which has to end with the result and the score. BOARD is
+# sent after every move, so the replies to the move are every line before its reply.
+def test_whole_game():
+
+    async def check(client):
+        squares = "........."
+        replies = []
+
+        while not any(line.startswith("RESULT") for line in replies):
+            client.writer.write(f"MOVE {squares.index('.') + 1}\nBOARD\n".encode())
+            replies = []
+
+            while not (line := await client.reply()).startswith("BOARD"):
+                replies.append(line)
+
+            squares = line.split()[1]
+            assert replies[0].startswith("MOVED x ")
+            assert all(line.startswith(("MOVED o ", "RESULT ", "SCORE ")) for line in replies[1:])
+
+        end = [line.split()[0] for line in replies].index("RESULT")
+        result = replies[end].split()[1]
+        assert result in ("x", "o", "d")
+        assert replies[end + 1] == "SCORE " + " ".join("1" if result == symbol else "0" for symbol in ("x", "o", "d"))
+
+        # The next game has started, with the robot's first move if it is its turn.
+        assert (squares.count("x"), squares.count("o")) == (0, len(replies) - end - 2)
+
+    run_session(check)
@@ -0,0 +1,48 @@
+"""
+Project: Tic-Tac-Toe
+Description: Checks the solved table against a plain minimax on every position that can come up in a game. The table
+             is solved again into a temporary file, so the check doesn't depend on a file left by an older version.
+Usage: python -m pytest -q tests/test_solved_table.py
+"""
+import pytest
+
+import brute_force
+import solved_table
+
+
+# table function solves the table once for every test in this file.
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    table = solved_table.SolvedTable(str(tmp_path_factory.mktemp("table") / "solved_table.bin"))
+    yield table
+    table.close()
+
+
+# The stored value of every position is the minimax value, and its best square keeps that value.
+def test_values_and_moves(table):
+
+    for cells, symbol in brute_force.reachable_positions():
+        board = brute_force.make_board(cells, symbol)
+        result, move, moves_left = table.lookup(table.index(board, symbol))
+        other = "o" if symbol == "x" else "x"
+        assert result == brute_force.value(cells, symbol), (cells, symbol)
+        assert cells[move - 1] == " "
+        assert -brute_force.value(cells[:move - 1] + (symbol,) + cells[move:], other) == result, (cells, symbol, move)
+        assert 1 <= moves_left <= cells.count(" ")
+
+
+# A game o started is looked up with the colours swapped, and has to get the same square.
+def test_games_o_started(table):
+
+    for cells, symbol in brute_force.reachable_positions():
+        swapped = tuple({"x": "o", "o": "x", " ": " "}[spot] for spot in cells)
+        other = "o" if symbol == "x" else "x"
+        assert table.best_move(brute_force.make_board(swapped, other), other) == \
+            table.best_move(brute_force.make_board(cells, symbol), symbol)
+
+
+# A position that can't come up in a game, like x having two more pieces than o, isn't in the table.
+def test_unreachable_position(table):
+
+    with pytest.raises(ValueError):
+        table.lookup(solved_table.TERNARY[0b11] + 2 * solved_table.TERNARY[0])
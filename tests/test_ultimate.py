@@ -0,0 +1,155 @@
+"""
+Project: Tic-Tac-Toe
+Description: Plays random games of ultimate tic-tac-toe and checks the legal moves and the winner after every move
+             against working them out again from the 9x9 grid, without the board's masks and tables.
+Usage: python -m pytest -q tests/test_ultimate.py
+"""
+import random
+
+import brute_force
+import ultimate
+from engine import Scoreboard
+
+# GAMES is how many random games are played.
+GAMES = 500
+
+
+# sub_cells function returns the 9 squares (0 to 80) of the small board, row by row.
+def sub_cells(sub):
+    return [(sub // 3 * 3 + row) * 9 + sub % 3 * 3 + column for row in range(3) for column in range(3)]
+
+
+# sub_result function returns who finished the small board on the grid, "d" if it is full without a winner, or None.
+def sub_result(grid, sub):
+    cells = [grid[square] for square in sub_cells(sub)]
+    return brute_force.winner(cells) or (None if " " in cells else "d")
+
+
+# game_winner function returns who won the game from the results of the small boards, "d" if every small board is
+# finished without three in a row of them, or None.
+def game_winner(results):
+    big_board = [result if result in ("x", "o") else " " for result in results]
+    return brute_force.winner(big_board) or (None if None in results else "d")
+
+
+# legal_moves function returns the squares (1 to 81) that can be played after the last move (0 to 80, or None at the
+# start), given the results of the small boards. The move is sent to the small board in the same place as its square
+# in its own small board.
+def legal_moves(grid, results, last_move):
+
+    if game_winner(results) is not None:
+        return []
+
+    subs = [sub for sub in range(9) if results[sub] is None]
+
+    if last_move is not None:
+        row, column = divmod(last_move, 9)
+        target = row % 3 * 3 + column % 3
+
+        if target in subs:
+            subs = [target]
+
+    return sorted(square + 1 for sub in subs for square in sub_cells(sub) if grid[square] == " ")
+
+
+def test_random_games():
+    generator = random.Random(20)
+    board = ultimate.UltimateBoard(Scoreboard(), verbose=False)
+
+    for _ in range(GAMES):
+        board.reset()
+        grid = [" "] * 81
+        last_move = None
+        symbol = "x"
+        results = [None] * 9
+
+        while True:
+            moves = legal_moves(grid, results, last_move)
+            assert sorted(board.legal_moves()) == moves
+            assert [board.is_legal(move) for move in range(1, 82)] == [move in moves for move in range(1, 82)]
+
+            if not moves:
+                break
+
+            move = generator.choice(moves)
+            board.place(move, symbol)
+            grid[move - 1] = symbol
+            last_move = move - 1
+            symbol = "o" if symbol == "x" else "x"
+            results = [sub_result(grid, sub) for sub in range(9)]
+            assert board.moves == grid
+            assert board.winner == game_winner(results)
+            assert board.sub_winners == results
+
+        # Taking every move back leaves the board the same as a new one.
+        while board.history:
+            board.unplace()
+
+        empty = ultimate.UltimateBoard(Scoreboard(), verbose=False)
+        assert (board.moves, board.cells, board.sub_winners, board.meta) == \
+            (empty.moves, empty.cells, empty.sub_winners, empty.meta)
+        assert (board.finished, board.next_board, board.winner, board.hash) == (0, None, None, 0)
+
+
+# Played with new_move the board gives the result to the score and starts again once the game is won.
+def test_new_move_scores():
+    generator = random.Random(21)
+    points = Scoreboard()
+    board = ultimate.UltimateBoard(points, verbose=False)
+
+    for game in range(50):
+        grid = [" "] * 81
+
+        while True:
+            move = generator.choice(board.legal_moves())
+            grid[move - 1] = board.current_symbol
+            board.new_move(move, board.current_symbol)
+            results = [sub_result(grid, sub) for sub in range(9)]
+
+            if game_winner(results) is not None:
+                break
+
+        assert board.last_result == game_winner(results)
+        assert points.total_games() == game + 1
+        assert board.moves == [" "] * 81
+
+
+# ultimate_move always plays a legal square, and takes a small board that wins the game when it can.
+def test_ultimate_move():
+    generator = random.Random(22)
+    searcher = ultimate.UltimateSearcher(time_budget=0.02)
+    board = ultimate.UltimateBoard(Scoreboard(), verbose=False)
+    positions = 0
+
+    while positions < 40:
+        board.reset()
+        symbol = "x"
+
+        for _ in range(generator.randrange(40)):
+            moves = board.legal_moves()
+
+            if not moves:
+                break
+
+            board.place(generator.choice(moves), symbol)
+            symbol = "o" if symbol == "x" else "x"
+
+        if board.winner is not None:
+            continue
+
+        winning = []
+
+        for move in board.legal_moves():
+            grid = list(board.moves)
+            grid[move - 1] = symbol
+
+            if game_winner([sub_result(grid, sub) for sub in range(9)]) == symbol:
+                winning.append(move)
+
+        move = searcher.best_move(board, symbol)
+        assert board.is_legal(move)
+
+        if winning:
+            assert move in winning
+
+        positions += 1
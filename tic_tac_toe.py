@@ -4,372 +4,562 @@ Description: This program is a simple tic-tac-toe game. There are three game mod
              "pvr" (player vs robot, "rvr" (robot vs robot). "rvr" mode only plays 3 games. Initially starts on "pvp".
 Author: Riley Morrison
 Date: 8/02/2025
+Usage: python tic_tac_toe.py [--rows ROWS] [--columns COLUMNS] [--k K] [--layered] [--fps FPS]
+       [--metrics FILE] [--metrics-interval SECONDS] [--log FILE] [--robot STRATEGY] [--robot-deadline SECONDS]
+       [--scores FILE] [--fsync-interval SECONDS] [--ultimate]
 """
-import pygame
-import random
+import argparse
+import heapq
+import itertools
+import time
+from collections import OrderedDict
 
+import engine
+import gamelog
+import metrics
+from engine import Board, Scoreboard
 
-# Scoreboard class keeps track of the score.
-class Scoreboard:
+# pygame is only imported by load_pygame when the window is first used, so other programs can import this file
+# without paying for starting SDL.
+pygame = None
 
-    # Initiates the default values.
+
+# load_pygame function imports pygame the first time it is called and returns it.
+def load_pygame():
+    global pygame
+
+    if pygame is None:
+        import pygame as module
+        pygame = module
+
+    return pygame
+
+
+# Scheduler class runs callbacks after a delay, so the game can pause without stopping the window.
+class Scheduler:
+
+    # Initiates the timers. Each timer is a list of when it is due, a count so timers due at the same time keep their
+    # order, and the callback, which is set to None if the timer is cancelled.
     def __init__(self):
-        self.x_score = 0
-        self.o_score = 0
-        self.draw = 0
+        load_pygame()
+        self.timers = []
+        self.count = itertools.count()
+
+    # call_later method runs the callback after the delay in milliseconds and returns the timer so it can be cancelled.
+    def call_later(self, delay, callback):
+        timer = [pygame.time.get_ticks() + delay, next(self.count), callback]
+        heapq.heappush(self.timers, timer)
+        return timer
 
-    # add_score method adds one points to the symbol put in the parameter. Can only be x or o.
-    def add_score(self, symbol):
+    # cancel method stops a timer from running.
+    def cancel(self, timer):
 
-        # Checks what symbol is in the parameter and adds one to their score.
-        if symbol == "x":
-            self.x_score += 1
+        if timer is not None:
+            timer[2] = None
 
-        elif symbol == "o":
-            self.o_score += 1
+    # run_due method runs every timer that is due.
+    def run_due(self):
+        now = pygame.time.get_ticks()
 
-        elif symbol == "d":
-            self.draw += 1
+        while self.timers and self.timers[0][0] <= now:
+            callback = heapq.heappop(self.timers)[2]
 
-    # get_x_score method returns the x player's score.
-    def get_x_score(self):
-        return self.x_score
+            if callback is not None:
+                callback()
 
-    # get_o_score method returns the o player's score.
-    def get_o_score(self):
-        return self.o_score
+    # time_until_next method returns the milliseconds until the next timer is due, or None if there aren't any.
+    def time_until_next(self):
 
-    # Returns a readable version of the score if class is printed.
-    def __str__(self):
-        return (f"X : {self.x_score}"
-                f"O : {self.o_score}")
+        while self.timers and self.timers[0][2] is None:
+            heapq.heappop(self.timers)
 
-    # reset method resets the players scores.
-    def reset(self):
-        print("Score Reset")
-        self.o_score = 0
-        self.x_score = 0
-        self.draw = 0
+        if not self.timers:
+            return None
 
+        return max(0, self.timers[0][0] - pygame.time.get_ticks())
 
-# Board class keeps track of moves done and checks if there is a win, and if so gives it to the Scoreboard class.
-class Board:
 
-    # Initiates the defaults values and the defaults scoreboard object being used.
-    def __init__(self, points):
-        self.moves = [" ", " ", " ", " ", " ", " ", " ", " ", " "]
-        self.total_moves = 0
-        self.total_games = 0
-        self.points = points
-        self.mode = "pvp"
-        self.mode_hover = "none"
-        self.reset_hover = "none"
-        self.current_symbol = "x"
-        self.possible_moves = [1, 2, 3, 4, 5, 6, 7, 8, 9]
+# TextCache class keeps the text it has rendered, so the same text isn't rendered again every frame. It holds at most
+# capacity surfaces and forgets the one used longest ago when it is full.
+class TextCache:
 
-    # new_move method records a move and takes it out of the possible moves list. Swaps what players turn it is.
-    def new_move(self, move, symbol):
-        self.moves[move - 1] = symbol
-        self.possible_moves.remove(move)
-        self.total_moves += 1
-        self.check_win()
+    # Initiates the empty cache and its counters.
+    def __init__(self, capacity=64):
+        load_pygame()
+        self.capacity = capacity
+        self.surfaces = OrderedDict()
+        self.fonts = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
-        match self.current_symbol:
+    # render method returns the surface of the text in the colour and font size, rendering it only if it isn't
+    # in the cache.
+    def render(self, text, colour, size):
+        key = (text, colour, size)
+        surface = self.surfaces.get(key)
 
-            case "x":
-                self.current_symbol = "o"
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
 
-            case "o":
-                self.current_symbol = "x"
-
-    # Returns a readable version of the board if the method is printed.
-    def __str__(self):
-        return (f"| {self.moves[0]} | {self.moves[1]} | {self.moves[2]} |"
-                f"\n- - - - - - -"
-                f"\n| {self.moves[3]} | {self.moves[4]} | {self.moves[5]} |"
-                f"\n- - - - - - -"
-                f"\n| {self.moves[6]} | {self.moves[7]} | {self.moves[8]} |")
-
-    # get_moves method returns a list that represents the board to show what piece is where.
-    def get_moves(self):
-        return self.moves
-
-    # reset method makes the board empty, resetting back to the default values. This does not change the score.
-    def reset(self):
-        self.moves = [" ", " ", " ", " ", " ", " ", " ", " ", " "]
-        self.possible_moves = [1, 2, 3, 4, 5, 6, 7, 8, 9]
-        self.total_moves = 0
-
-    # new_game method does the same as the reset method, but it resets the score as well.
-    def new_game(self):
-        self.reset()
-        self.points.reset()
+        self.misses += 1
+        font = self.fonts.get(size)
+
+        if font is None:
+            font = self.fonts[size] = pygame.font.SysFont("Arial", size)
 
-    # win method updates the score and gets it ready for a new game.
-    # Also keeps track of the total games when in "rvr" mode, so it can reset after 3 games.
-    # Allows three symbols 'x', 'o' and 'd' (draw).
+        surface = self.surfaces[key] = font.render(text, True, colour)
+
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+
+        return surface
+
+    # stats method returns the cache counters.
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self.surfaces)}
+
+    # clear method empties the cache and resets the counters.
+    def clear(self):
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+# GameBoard class is the Board used by the window. It pauses when a game is over so the players can see the result.
+class GameBoard(Board):
+
+    # Initiates the board with the scheduler used to time the pause.
+    def __init__(self, points, scheduler, **options):
+        super().__init__(points, **options)
+        self.scheduler = scheduler
+        self.game_over = False
+        self.win_timer = None
+        # robot is the name of the strategy the robot plays with. decision is the future of the move the robot is
+        # working out in the background, or None, and thinking is True once it has taken longer than its pause.
+        self.robot = "intelligent_move"
+        self.decision = None
+        self.thinking = False
+        # decision_timers are the pause and deadline timers of the decision, cancelled along with it.
+        self.decision_timers = []
+
+    # win method waits a second before giving the result to the Board class. Nobody can move while it waits.
     def win(self, symbol):
-        pygame.time.wait(1000)
-        self.reset()
-        self.points.add_score(symbol)
+        self.game_over = True
+        self.win_timer = self.scheduler.call_later(1000, lambda: self.finish(symbol))
+
+    # finish method gives the result to the Board class once the pause is over.
+    def finish(self, symbol):
+        self.game_over = False
+        self.win_timer = None
 
-        if self.mode == "rvr":
-            self.total_games += 1
+        if self.mode in MODE_PLAYERS:
+            x_player, o_player = MODE_PLAYERS[self.mode]
+            self.strategy_names = {"x": self.robot if x_player == "robot" else x_player,
+                                   "o": self.robot if o_player == "robot" else o_player}
 
-        # Goes to menu after three games in "rvr", so there isn't an infinite loop.
-        if self.total_games == 3:
-            self.mode = "menu"
-            self.total_games = 0
-            self.mode_hover = "none"
-            self.reset()
+        super().win(symbol)
 
-    # check_win method checks if any player has won, and if so calls the win method, also checks if it is a draw.
-    # Note that this method doesn't check pre-defined conditions, but independently checks for a win.
-    def check_win(self):
+        # Games in the window are few and far between, so each one is written straight away instead of waiting for
+        # the log's buffer to fill, and isn't lost if the game crashes.
+        if self.log is not None:
+            self.log.flush()
 
-        # Checks for a horizontal win.
-        for column in range(3):
-            total_symbol = 0
+    # cancel_decision method forgets the move the robot is working out, so it is never played, and stops its timers.
+    # A robot that has already started is told to stop searching, so the next decision doesn't wait behind it.
+    def cancel_decision(self):
 
-            for row in range(3):
+        if (self.decision is not None) and (not self.decision.cancel()) and (not self.decision.done()):
+            engine.stop_searches()
 
-                if self.moves[(column * 3) + row] == self.current_symbol:
-                    total_symbol += 1
+        for timer in self.decision_timers:
+            self.scheduler.cancel(timer)
 
-            if total_symbol == 3:
-                print("Horizontal Win!")
-                self.win(self.current_symbol)
+        self.decision = None
+        self.decision_timers = []
+        self.thinking = False
 
-        # Checks for a vertical win.
-        for row in range(3):
-            total_symbol = 0
+    # new_game method also stops a game that is being paused from giving its result to the new game, and the robot
+    # from playing a move it was working out for the old one.
+    def new_game(self):
+        self.scheduler.cancel(self.win_timer)
+        self.win_timer = None
+        self.game_over = False
+        self.cancel_decision()
+        super().new_game()
 
-            for column in range(3):
 
-                if self.moves[(column * 3) + row] == self.current_symbol:
-                    total_symbol += 1
+# UltimateGameBoard is the GameBoard class for ultimate tic-tac-toe, it is made by load_ultimate the first time it is
+# played, so ultimate is only imported then.
+UltimateGameBoard = None
 
-            if total_symbol == 3:
-                print("Vertical Win!")
-                self.win(self.current_symbol)
 
-        # Checks for a diagonal win.
-        for diagonal in range(2):
-            total_symbol = 0
+# load_ultimate function makes the GameBoard class for ultimate tic-tac-toe the first time it is called and returns it.
+# It pauses at the end of a game the same way as the GameBoard.
+def load_ultimate():
+    global UltimateGameBoard
 
-            for intercept in range(3):
+    if UltimateGameBoard is None:
+        import ultimate
 
-                if (diagonal * 2) == 0:
+        class UltimateGameBoard(GameBoard, ultimate.UltimateBoard):
+            pass
 
-                    if self.moves[intercept * 4] == self.current_symbol:
-                        total_symbol += 1
+    return UltimateGameBoard
 
-                else:
 
-                    if self.moves[(diagonal * 2) + (intercept * 2)] == self.current_symbol:
-                        total_symbol += 1
+# DEADLINE_SHARE is the most of the robot's deadline a search robot is given to think.
+DEADLINE_SHARE = 0.8
+
+# MODES lists the mode buttons from the top of the screen down.
+MODES = ["pvp", "pvr", "rvr"]
 
-            if total_symbol == 3:
-                print("Diagonal Win!")
-                self.win(self.current_symbol)
+# MODE_PLAYERS gives who plays x and o in every mode, for the game log.
+MODE_PLAYERS = {"pvp": ("human", "human"), "pvr": ("human", "robot"), "rvr": ("robot", "robot")}
 
-        # Calls win if it is a draw.
-        if self.total_moves == 9:
-            self.win("d")
+
+# Layout class works out where everything goes on the screen once, so drawing and the cursor both use the same
+# rectangles instead of working them out again every frame. Everything is made for a 1000 by 1000 screen and
+# divided by the offset.
+class Layout:
+
+    # Initiates the layout for the board's size and the screen size offset.
+    def __init__(self, board, offset):
+        load_pygame()
+        self.rows = board.rows
+        self.columns = board.columns
+        self.offset = offset
+        # cell is how big each square is, so the board always fits in the 900 by 900 area. scale is used for the
+        # symbols, which were made for 300 by 300 squares.
+        self.cell = 900 / max(board.rows, board.columns) / offset
+        scale = self.cell / 300
+        self.board_width = board.columns * self.cell
+        self.board_height = board.rows * self.cell
+        self.button_height = 300 / offset
+        self.panel_left = 900 / offset
+        self.bar_top = 900 / offset
+
+        # rects stores the rectangle of every part of the screen that can change, squares by their number from 0.
+        self.rects = {}
+
+        for square in range(board.size):
+            self.rects[square] = ((square % board.columns) * self.cell, (square // board.columns) * self.cell, self.cell, self.cell)
+
+        for number, mode in enumerate(MODES):
+            self.rects[mode] = (900 / offset, number * 300 / offset, 100 / offset, 300 / offset)
+
+        self.rects["reset"] = (900 / offset, 900 / offset, 100 / offset, 100 / offset)
+        self.rects["x"] = (0, 900 / offset, 300 / offset, 100 / offset)
+        self.rects["o"] = (300 / offset, 900 / offset, 300 / offset, 100 / offset)
+        self.rects["d"] = (600 / offset, 900 / offset, 300 / offset, 100 / offset)
+        self.score_bar = (0, 900 / offset, 900 / offset, 100 / offset)
+
+        # regions stores the same rectangles rounded to whole pixels, used for updating parts of the window.
+        self.regions = {region: pygame.Rect([round(value) for value in rect]) for region, rect in self.rects.items()}
+
+        # letters stores where each letter on the mode buttons is written, and score_text where each score is written.
+        self.letters = {mode: [(letter, 940 / offset, (number * 300 + height) / offset) for letter, height in zip(mode, (45, 95, 145))]
+                        for number, mode in enumerate(MODES)}
+        self.score_text = {"x": (110 / offset, 915 / offset), "o": (410 / offset, 915 / offset), "d": (710 / offset, 915 / offset)}
+
+        # lines stores the colour, start and end of every line drawn on the screen.
+        self.lines = []
+
+        for column in range(1, board.columns):
+            self.lines.append(("white", (column * self.cell, 0), (column * self.cell, self.board_height)))
+
+        for row in range(1, board.rows):
+            self.lines.append(("white", (0, row * self.cell), (self.board_width, row * self.cell)))
+
+        # The lines between the small boards of ultimate tic-tac-toe are drawn again over the others in another colour.
+        if board.nested:
+
+            for number in (3, 6):
+                self.lines.append(("navy", (number * self.cell, 0), (number * self.cell, self.board_height)))
+                self.lines.append(("navy", (0, number * self.cell), (self.board_width, number * self.cell)))
+
+        # The lines between the scores, between the mode buttons, around the edge and the red reset cross.
+        for start, end in [((300, 900), (300, 1000)), ((600, 900), (600, 1000)), ((900, 300), (1000, 300)),
+                           ((900, 600), (1000, 600)), ((0, 900), (1000, 900)), ((900, 0), (900, 1000)),
+                           ((0, 0), (0, 1000)), ((0, 0), (1000, 0)), ((0, 1000), (1000, 1000)), ((1000, 0), (1000, 1000))]:
+            self.lines.append(("white", (start[0] / offset, start[1] / offset), (end[0] / offset, end[1] / offset)))
+
+        self.lines.append(("red", (925 / offset, 925 / offset), (975 / offset, 975 / offset)))
+        self.lines.append(("red", (975 / offset, 925 / offset), (925 / offset, 975 / offset)))
+
+        # cross_lines and circle_centres store where the symbols are drawn on each square.
+        self.cross_lines = []
+        self.circle_centres = []
+
+        for square in range(board.size):
+            left, top = self.rects[square][0], self.rects[square][1]
+            self.cross_lines.append((((110 * scale) + left, (110 * scale) + top), ((190 * scale) + left, (190 * scale) + top),
+                                     ((110 * scale) + left, (190 * scale) + top), ((190 * scale) + left, (110 * scale) + top)))
+            self.circle_centres.append(((150 * scale) + left, (150 * scale) + top))
+
+        self.cross_width = max(1, int(10 * scale))
+        self.outer_radius = int(40 * scale)
+        self.inner_radius = int(25 * scale)
+
+    # region_at method returns what is at the position, a square number from 0, a mode, "reset", or None.
+    # It divides by the size of a square or button instead of checking every one.
+    def region_at(self, position):
+        x_position, y_position = position
+
+        if (0 < x_position < self.board_width) and (0 < y_position < self.board_height):
+            return int(y_position // self.cell) * self.columns + int(x_position // self.cell)
+
+        if self.panel_left < x_position < self.panel_left * 10 / 9:
+
+            if 0 < y_position < self.bar_top:
+                return MODES[int(y_position // self.button_height)]
+
+            if self.bar_top < y_position < self.bar_top * 10 / 9:
+                return "reset"
+
+        return None
 
 
 # Class creates the user interface and has methods that make it work.
 class BoardUI:
 
     # Initiates the UI. Changes the screen size to fit the monitor.
-    def __init__(self, board, points):
+    # If layered is True the still parts of the screen are drawn once and only the parts that change are redrawn.
+    def __init__(self, board, points, layered=False):
+        load_pygame()
         self.board = board
-        self.offset = 1
 
-        # This loop changes the screen size offset which is used by everything seen on the screen.
-        while (1000 / self.offset) >= pygame.display.Info().current_h:
-            self.offset += 1
+        # The screen size offset is used by everything seen on the screen. It is the smallest whole number that makes
+        # the 1000 pixel window shorter than the monitor.
+        self.offset = 1000 // max(1, pygame.display.Info().current_h) + 1
 
         self.screen = pygame.display.set_mode([1000 / self.offset, 1000 / self.offset])
         pygame.display.set_caption("Tic-Tac-Toe")
         self.text_size = 60 / self.offset
-        self.text_font = pygame.font.SysFont("Arial", int(self.text_size))
+        # text_cache keeps the rendered text, which only changes when the score or a button's colour changes.
+        self.text_cache = TextCache()
         self.points = points
-        # position_values list stores the location of each place that can have a piece placed on it.
-        self.position_values = [[0, 0], [300, 0], [600, 0], [0, 300], [300, 300], [600, 300], [0, 600], [300, 600], [600, 600]]
+        self.layout = Layout(board, self.offset)
+        self.layered = layered
+        self.hover = None
+        # thinking is True while the robot whose turn it is is still working out its move.
+        self.thinking = False
+
+        if layered:
+            self.build_layers()
+
+    # build_layers method draws the background and the lines once to their own surfaces.
+    # drawn keeps what each part of the screen looked like when it was last drawn.
+    def build_layers(self):
+        size = self.screen.get_size()
+        self.background = pygame.Surface(size)
+        self.background.fill("dodgerblue")
+        pygame.draw.rect(self.background, "dodgerblue4", self.layout.score_bar)
+        self.lines = pygame.Surface(size)
+        self.lines.fill("black")
+        self.lines.set_colorkey("black")
+        self.draw_lines(self.lines)
+        self.drawn = {}
+
+    # region_state method returns everything that changes how a part of the screen looks.
+    def region_state(self, region):
+
+        match region:
+
+            case "pvp" | "pvr" | "rvr":
+                return self.board.mode == region, self.board.mode_hover == region
+
+            case "reset":
+                return self.board.reset_hover
+
+            case "x":
+                return self.points.x_score, self.board.current_symbol, self.thinking
+
+            case "o":
+                return self.points.o_score, self.board.current_symbol, self.thinking
+
+            case "d":
+                return self.points.draw
+
+        hover = self.hover[1] if (self.hover is not None) and (self.hover[0] == region) else None
+        return self.board.moves[region], hover
+
+    # draw_region method redraws one part of the screen on top of the background, then puts the lines back on top.
+    def draw_region(self, region):
+        rect = self.layout.regions[region]
+        self.screen.set_clip(rect)
+        self.screen.blit(self.background, rect, rect)
+
+        match region:
+
+            case "pvp" | "pvr" | "rvr":
+                self.draw_mode_button(region)
+
+            case "reset":
+                self.draw_reset_button()
+
+            case "x" | "o" | "d":
+                self.draw_score(region)
+
+        self.screen.blit(self.lines, rect, rect)
+
+        # Squares have their symbol drawn on top of the lines, like load_symbols does.
+        if not isinstance(region, str):
+            spot, hover = self.region_state(region)
+
+            if spot != " ":
+                self.draw_symbol(False, spot, region)
 
-    # write_text method allows text to be written at the specified location.
-    def write_text(self, text, font, text_colour, width, height):
-        writing = font.render(text, True, text_colour)
+            elif hover is not None:
+                self.draw_symbol(True, hover, region)
+
+        self.screen.set_clip(None)
+
+    # show method puts the frame on the window. In layered mode only the parts that have changed since the last frame
+    # are redrawn and updated, otherwise the whole window is flipped.
+    def show(self):
+
+        if not self.layered:
+            pygame.display.flip()
+            return
+
+        # The first frame draws everything.
+        first_frame = not self.drawn
+
+        if first_frame:
+            self.screen.blit(self.background, (0, 0))
+            self.screen.blit(self.lines, (0, 0))
+
+        dirty = []
+
+        for region, rect in self.layout.regions.items():
+            state = self.region_state(region)
+
+            if self.drawn.get(region) != state:
+                self.draw_region(region)
+                self.drawn[region] = state
+                dirty.append(rect)
+
+        if first_frame:
+            pygame.display.flip()
+
+        elif dirty:
+            pygame.display.update(dirty)
+
+    # write_text method allows text to be written at the specified location. The text is only rendered the first time
+    # it is written in that colour.
+    def write_text(self, text, text_colour, width, height):
+        writing = self.text_cache.render(text, text_colour, int(self.text_size))
         self.screen.blit(writing, (width, height))
 
     # Loads the board and symbols again, so the symbols are updated.
+    # In layered mode nothing is drawn here, it only forgets the hovering symbol and show draws what has changed.
     def load_symbols(self):
+
+        if self.layered:
+            self.hover = None
+            return
+
         self.draw_board()
-        x_points = self.points.x_score
-        o_points = self.points.o_score
-        draw = self.points.draw
 
         # Creates the scoreboard, so you can tell the score.
-        match board1.current_symbol:
+        for symbol in ("x", "o", "d"):
+            self.draw_score(symbol)
 
-            case "x":
-                self.write_text(f"x : {x_points}", self.text_font, "orange", 110 / self.offset, 915 / self.offset)
-                self.write_text(f"o : {o_points}", self.text_font, "white", 410 / self.offset, 915 / self.offset)
+        # Puts the player symbols on the board at each location placed.
+        for square, spot in enumerate(self.board.get_moves()):
 
-            case "o":
-                self.write_text(f"x : {x_points}", self.text_font, "white", 110 / self.offset, 915 / self.offset)
-                self.write_text(f"o : {o_points}", self.text_font, "hotpink2", 410 / self.offset, 915 / self.offset)
+            if spot != " ":
+                self.place(False, spot, square)
 
-        self.write_text(f"d : {draw}", self.text_font, "white", 710 / self.offset, 915 / self.offset)
-        moves = self.board.get_moves()
-        x_moves = []
-        o_moves = []
-        number = 0
+    # draw_score method writes one of the scores, the player whose turn it is has their score in their colour.
+    # While the robot is still thinking after its pause its score is followed by dots.
+    def draw_score(self, symbol):
+        text_colour = "white"
+        dots = " ..." if (symbol == self.board.current_symbol) & self.thinking else ""
 
-        # Converts the values from moves list to know the location of each move and who did it.
-        for spot in moves:
+        if (symbol == "x") & (self.board.current_symbol == "x"):
+            text_colour = "orange"
 
-            if spot == "x":
-                x_moves.append(number)
+        elif (symbol == "o") & (self.board.current_symbol == "o"):
+            text_colour = "hotpink2"
 
-            elif spot == "o":
-                o_moves.append(number)
+        score = {"x": self.points.x_score, "o": self.points.o_score, "d": self.points.draw}[symbol]
+        self.write_text(f"{symbol} : {score}{dots}", text_colour, *self.layout.score_text[symbol])
 
-            number += 1
+    # draw_mode_button method draws a mode button. It is lighter when hovered over and dark with green writing when
+    # it is the selected mode.
+    def draw_mode_button(self, mode):
+        colour = "dodgerblue3"
+        text_colour = "white"
 
-        # Puts the player symbols on the board at each location placed.
-        for spot in x_moves:
-            self.place(False, "x", spot)
+        if self.board.mode_hover == mode:
+            colour = "deepskyblue3"
+
+        if self.board.mode == mode:
+            colour = "dodgerblue4"
+            text_colour = "green"
+
+        pygame.draw.rect(self.screen, colour, self.layout.rects[mode])
 
-        for spot in o_moves:
-            self.place(False, "o", spot)
+        for letter, width, height in self.layout.letters[mode]:
+            self.write_text(letter, text_colour, width, height)
+
+    # draw_reset_button method draws the reset button, which changes colour when your cursor is hovering over it.
+    def draw_reset_button(self):
+        colour = "brown4" if self.board.reset_hover == "reset" else "deepskyblue4"
+        pygame.draw.rect(self.screen, colour, self.layout.rects["reset"])
 
     # Makes the board without symbols, except for the mode buttons, because it does not change except for colour.
+    # In layered mode the show method does this instead.
     def draw_board(self):
+
+        if self.layered:
+            return
+
         self.screen.fill("dodgerblue")
-        pygame.draw.rect(self.screen, "dodgerblue4", (0, 900 / self.offset, 900 / self.offset, 100 / self.offset))
-        pygame.draw.rect(self.screen, "deepskyblue4", (900 / self.offset, 900 / self.offset, 100 / self.offset, 100 / self.offset))
-
-        # Makes the reset button change colour when your cursor is hovering over it.
-        if self.board.reset_hover == "reset":
-            pygame.draw.rect(self.screen, "brown4", (900 / self.offset, 900 / self.offset, 100 / self.offset, 100 / self.offset))
-
-        # Makes the modes buttons change colour when your cursor is hovering over it.
-        match self.board.mode_hover:
-
-            case "none":
-                pygame.draw.rect(self.screen, "dodgerblue3", (900 / self.offset, 0, 100 / self.offset, 300 / self.offset))
-                pygame.draw.rect(self.screen, "dodgerblue3", (900 / self.offset, 300 / self.offset, 100 / self.offset, 300 / self.offset))
-                pygame.draw.rect(self.screen, "dodgerblue3", (900 / self.offset, 600 / self.offset, 100 / self.offset, 300 / self.offset))
-
-            case "pvp":
-                pygame.draw.rect(self.screen, "deepskyblue3", (900 / self.offset, 0, 100 / self.offset, 300 / self.offset))
-                pygame.draw.rect(self.screen, "dodgerblue3", (900 / self.offset, 300 / self.offset, 100 / self.offset, 300 / self.offset))
-                pygame.draw.rect(self.screen, "dodgerblue3", (900 / self.offset, 600 / self.offset, 100 / self.offset, 300 / self.offset))
-
-            case "pvr":
-                pygame.draw.rect(self.screen, "dodgerblue3", (900 / self.offset, 0, 100 / self.offset, 300 / self.offset))
-                pygame.draw.rect(self.screen, "deepskyblue3", (900 / self.offset, 300 / self.offset, 100 / self.offset, 300 / self.offset))
-                pygame.draw.rect(self.screen, "dodgerblue3", (900 / self.offset, 600 / self.offset, 100 / self.offset, 300 / self.offset))
-
-            case "rvr":
-                pygame.draw.rect(self.screen, "dodgerblue3", (900 / self.offset, 0, 100 / self.offset, 300 / self.offset))
-                pygame.draw.rect(self.screen, "dodgerblue3", (900 / self.offset, 300 / self.offset, 100 / self.offset, 300 / self.offset))
-                pygame.draw.rect(self.screen, "deepskyblue3", (900 / self.offset, 600 / self.offset, 100 / self.offset, 300 / self.offset))
-
-        # Makes the mode buttons change colour when the mode is selected.
-        match self.board.mode:
-
-            case "pvp":
-                pygame.draw.rect(self.screen, "dodgerblue4", (900 / self.offset, 0, 100 / self.offset, 300 / self.offset))
-                self.write_text("p", self.text_font, "green", 940 / self.offset, 45 / self.offset)
-                self.write_text("v", self.text_font, "green", 940 / self.offset, 95 / self.offset)
-                self.write_text("p", self.text_font, "green", 940 / self.offset, 145 / self.offset)
-                self.write_text("p", self.text_font, "white", 940 / self.offset, 345 / self.offset)
-                self.write_text("v", self.text_font, "white", 940 / self.offset, 395 / self.offset)
-                self.write_text("r", self.text_font, "white", 940 / self.offset, 445 / self.offset)
-                self.write_text("r", self.text_font, "white", 940 / self.offset, 645 / self.offset)
-                self.write_text("v", self.text_font, "white", 940 / self.offset, 695 / self.offset)
-                self.write_text("r", self.text_font, "white", 940 / self.offset, 745 / self.offset)
-
-            case "pvr":
-                pygame.draw.rect(self.screen, "dodgerblue4", (900 / self.offset, 300 / self.offset, 100 / self.offset, 300 / self.offset))
-                self.write_text("p", self.text_font, "white", 940 / self.offset, 45 / self.offset)
-                self.write_text("v", self.text_font, "white", 940 / self.offset, 95 / self.offset)
-                self.write_text("p", self.text_font, "white", 940 / self.offset, 145 / self.offset)
-                self.write_text("p", self.text_font, "green", 940 / self.offset, 345 / self.offset)
-                self.write_text("v", self.text_font, "green", 940 / self.offset, 395 / self.offset)
-                self.write_text("r", self.text_font, "green", 940 / self.offset, 445 / self.offset)
-                self.write_text("r", self.text_font, "white", 940 / self.offset, 645 / self.offset)
-                self.write_text("v", self.text_font, "white", 940 / self.offset, 695 / self.offset)
-                self.write_text("r", self.text_font, "white", 940 / self.offset, 745 / self.offset)
-
-            case "rvr":
-                pygame.draw.rect(self.screen, "dodgerblue4", (900 / self.offset, 600 / self.offset, 100 / self.offset, 300 / self.offset))
-                self.write_text("p", self.text_font, "white", 940 / self.offset, 45 / self.offset)
-                self.write_text("v", self.text_font, "white", 940 / self.offset, 95 / self.offset)
-                self.write_text("p", self.text_font, "white", 940 / self.offset, 145 / self.offset)
-                self.write_text("p", self.text_font, "white", 940 / self.offset, 345 / self.offset)
-                self.write_text("v", self.text_font, "white", 940 / self.offset, 395 / self.offset)
-                self.write_text("r", self.text_font, "white", 940 / self.offset, 445 / self.offset)
-                self.write_text("r", self.text_font, "green", 940 / self.offset, 645 / self.offset)
-                self.write_text("v", self.text_font, "green", 940 / self.offset, 695 / self.offset)
-                self.write_text("r", self.text_font, "green", 940 / self.offset, 745 / self.offset)
-
-            case "menu":
-                self.write_text("p", self.text_font, "white", 940 / self.offset, 45 / self.offset)
-                self.write_text("v", self.text_font, "white", 940 / self.offset, 95 / self.offset)
-                self.write_text("p", self.text_font, "white", 940 / self.offset, 145 / self.offset)
-                self.write_text("p", self.text_font, "white", 940 / self.offset, 345 / self.offset)
-                self.write_text("v", self.text_font, "white", 940 / self.offset, 395 / self.offset)
-                self.write_text("r", self.text_font, "white", 940 / self.offset, 445 / self.offset)
-                self.write_text("r", self.text_font, "white", 940 / self.offset, 645 / self.offset)
-                self.write_text("v", self.text_font, "white", 940 / self.offset, 695 / self.offset)
-                self.write_text("r", self.text_font, "white", 940 / self.offset, 745 / self.offset)
-
-        # Creates the lines on the board.
-        pygame.draw.line(self.screen, "white", (300 / self.offset, 0), (300 / self.offset, 1000 / self.offset), 5)
-        pygame.draw.line(self.screen, "white", (600 / self.offset, 0), (600 / self.offset, 1000 / self.offset), 5)
-        pygame.draw.line(self.screen, "white", (0, 300 / self.offset), (1000 / self.offset, 300 / self.offset), 5)
-        pygame.draw.line(self.screen, "white", (0, 600 / self.offset), (1000 / self.offset, 600 / self.offset), 5)
-        pygame.draw.line(self.screen, "white", (0, 900 / self.offset), (1000 / self.offset, 900 / self.offset), 5)
-        pygame.draw.line(self.screen, "white", (900 / self.offset, 0), (900 / self.offset, 1000 / self.offset), 5)
-        pygame.draw.line(self.screen, "white", (0, 0), (0, 1000 / self.offset), 5)
-        pygame.draw.line(self.screen, "white", (0, 0), (1000 / self.offset, 0), 5)
-        pygame.draw.line(self.screen, "white", (0, 1000 / self.offset), (1000 / self.offset, 1000 / self.offset), 5)
-        pygame.draw.line(self.screen, "white", (1000 / self.offset, 0), (1000 / self.offset, 1000 / self.offset), 5)
-        pygame.draw.line(self.screen, "red", (925 / self.offset, 925 / self.offset), (975 / self.offset, 975 / self.offset), 5)
-        pygame.draw.line(self.screen, "red", (975 / self.offset, 925 / self.offset), (925 / self.offset, 975 / self.offset), 5)
+        pygame.draw.rect(self.screen, "dodgerblue4", self.layout.score_bar)
+        self.draw_reset_button()
 
-    # place method places a symbol on the board and is used by other methods to do this.
-    def place(self, hover, symbol, square):
-        # offsets are needed to make the symbols be placed on a set location.
-        x_offset = self.position_values[square][0] / self.offset
-        y_offset = self.position_values[square][1] / self.offset
+        for mode in MODES:
+            self.draw_mode_button(mode)
 
-        # Changes the colour of the symbol depending on player and if they are hovering over it or not.
-        if symbol == "x":
+        self.draw_lines(self.screen)
 
-            if hover:
-                colour = "white"
+    # draw_lines method draws the white lines and the red reset cross onto the surface.
+    def draw_lines(self, surface):
 
-            else:
-                colour = "orange"
+        for colour, start, end in self.layout.lines:
+            pygame.draw.line(surface, colour, start, end, 5)
+
+    # place method places a symbol on the board and is used by other methods to do this.
+    # In layered mode a hovering symbol is only remembered, and it is drawn by the show method.
+    def place(self, hover, symbol, square):
 
-            pygame.draw.line(self.screen, colour, (((110 / self.offset) + x_offset), ((110 / self.offset) + y_offset)), (((190 / self.offset) + x_offset), ((190 / self.offset) + y_offset)), int(10 / self.offset))
-            pygame.draw.line(self.screen, colour, (((110 / self.offset) + x_offset), ((190 / self.offset) + y_offset)), (((190 / self.offset) + x_offset), ((110 / self.offset) + y_offset)), int(10 / self.offset))
+        if self.layered and hover:
+            self.hover = (square, symbol)
 
-        elif symbol == "o":
+        else:
+            self.draw_symbol(hover, symbol, square)
 
-            if hover:
-                colour = "white"
+    # draw_symbol method draws a symbol on the square.
+    def draw_symbol(self, hover, symbol, square):
 
-            else:
-                colour = "hotpink2"
+        # Changes the colour of the symbol depending on player and if they are hovering over it or not.
+        if symbol == "x":
+            colour = "white" if hover else "orange"
+            start, end, other_start, other_end = self.layout.cross_lines[square]
+            pygame.draw.line(self.screen, colour, start, end, self.layout.cross_width)
+            pygame.draw.line(self.screen, colour, other_start, other_end, self.layout.cross_width)
 
-            pygame.draw.circle(self.screen, colour, (((150 / self.offset) + x_offset), ((150 / self.offset) + y_offset)), int(40 / self.offset))
-            pygame.draw.circle(self.screen, "dodgerblue1", (((150 / self.offset) + x_offset), ((150 / self.offset) + y_offset)), int(25 / self.offset))
+        elif symbol == "o":
+            colour = "white" if hover else "hotpink2"
+            pygame.draw.circle(self.screen, colour, self.layout.circle_centres[square], self.layout.outer_radius)
+            pygame.draw.circle(self.screen, "dodgerblue1", self.layout.circle_centres[square], self.layout.inner_radius)
 
 
 # Player class stores everything about the player and provides functionality.
@@ -383,25 +573,11 @@ class Player:
 
     # opposite_symbol determines the opposite symbol of the given symbol in its parameter.
     def opposite_symbol(self, symbol):
+        return engine.opposite_symbol(symbol)
 
-        match symbol:
-
-            case "x":
-                opposite_symbol = "o"
-
-            case "o":
-                opposite_symbol = "x"
-
-        return opposite_symbol
-
-    # check_move is a static method that checks if the move is allowed by checking the board.
+    # check_move method checks if the move is allowed by checking the board.
     def check_move(self, position):
-
-        if board1.get_moves()[position - 1] == " ":
-            return True
-
-        else:
-            return False
+        return self.board.is_legal(position)
 
     # make_move method makes a move for the player and gives it to the board.
     def make_move(self, position):
@@ -415,308 +591,362 @@ class Player:
     # random_move method makes a random move and was the original robot decision-making, taking into account the
     # possible moves.
     def random_move(self):
-        position = random.choice(self.board.possible_moves)
-        self.make_move(position)
-        pygame.time.wait(500)
+        self.make_move(engine.decide(engine.random_move, self.board, self.symbol))
 
     # one_off_win method checks if the given player is one off of making a move and returns the position of that move.
-    # This was a modified version of the check win method from the board class.
     def one_off_win(self, current_symbol):
+        return engine.one_off_win(self.board, current_symbol)
 
-        opposing_symbol = self.opposite_symbol(current_symbol)
-
-        # Checks for a horizontal one off.
-        for column in range(3):
-            total_symbol = 0
-            missing_symbol = []
+    # intelligent_move method is used by the robot to decide its move. The decision itself is made by the engine.
+    def intelligent_move(self):
+        self.make_move(engine.decide(engine.intelligent_move, self.board, self.symbol))
 
-            for row in range(3):
+    # strategy_move method makes the move the strategy with the name in engine.STRATEGIES decides.
+    def strategy_move(self, strategy):
+        self.make_move(engine.decide(strategy, self.board, self.symbol))
 
-                if self.board.moves[(column * 3) + row] == current_symbol:
-                    total_symbol += 1
+    # highlight method sets which button the cursor at the position is hovering over, without drawing anything. It is
+    # called before a frame is drawn, so the frame shows the highlight for where the cursor is now.
+    def highlight(self, position):
+        region = self.boardUI.layout.region_at(position)
+        self.board.mode_hover = region if (region in MODES) and (self.board.mode != region) else "none"
+        self.board.reset_hover = region if region == "reset" else "none"
 
-                elif self.board.moves[(column * 3) + row] != opposing_symbol:
-                    missing_symbol.append((column * 3) + row)
+    # cursor method provides functionality to the cursor to know where it is hovering and clicking over.
+    # If squares is False only the buttons work, which is used when it isn't a person's turn. The highlight of the
+    # buttons is drawn with the frame, set by highlight.
+    def cursor(self, position, hover, squares=True):
+        region = self.boardUI.layout.region_at(position)
 
-            if (total_symbol == 2) & (len(missing_symbol) > 0):
-                return int(missing_symbol[0] + 1)
+        # If the mode is not "menu" it allows the user to click on any square.
+        if isinstance(region, int):
 
-        # Checks for a vertical one off.
-        for row in range(3):
-            total_symbol = 0
-            missing_symbol = []
+            if (self.board.mode != "menu") & squares & self.check_move(region + 1):
 
-            for column in range(3):
+                # If cursor is hovering over a playable tile a cursor symbol is placed over it.
+                if hover:
+                    self.boardUI.place(hover, self.symbol, region)
 
-                if self.board.moves[(column * 3) + row] == current_symbol:
-                    total_symbol += 1
+                # If it is a valid move it is placed.
+                else:
+                    self.board.new_move(region + 1, self.symbol)
 
-                elif self.board.moves[(column * 3) + row] != opposing_symbol:
-                    missing_symbol.append((column * 3) + row)
+            # Nothing is highlighted when the cursor is over the board.
+            self.board.mode_hover = "none"
+            self.board.reset_hover = "none"
 
-            if (total_symbol == 2) & (len(missing_symbol) > 0):
-                return int(missing_symbol[0] + 1)
+        # Checks if cursor is above a mode button that isn't the selected mode.
+        elif (region in MODES) and (self.board.mode != region):
 
-        # Checks for a diagonal one off.
-        for diagonal in range(2):
-            total_symbol = 0
-            missing_symbol = []
+            # Provides functionality if clicked.
+            if not hover:
+                self.board.points.reset()
+                self.board.mode = region
+                self.board.new_game()
+                self.boardUI.draw_board()
+                self.boardUI.load_symbols()
 
-            for intercept in range(3):
+            # Highlights the button if hovered over.
+            else:
+                self.board.mode_hover = region
 
-                if (diagonal * 2) == 0:
+            # Stops highlighting the reset button.
+            self.board.reset_hover = "none"
 
-                    if self.board.moves[intercept * 4] == current_symbol:
-                        total_symbol += 1
+        # Checks if the cursor is above the reset button.
+        elif region == "reset":
 
-                    elif self.board.moves[intercept * 4] != opposing_symbol:
-                        missing_symbol.append(intercept * 4)
+            # Provides functionality if clicked.
+            if not hover:
+                self.board.points.reset()
+                self.board.new_game()
 
-                elif not ((diagonal * 2) == 0):
+            # Highlights the button if hovered over.
+            else:
+                self.board.reset_hover = "reset"
 
-                    if self.board.moves[(diagonal * 2) + (intercept * 2)] == current_symbol:
-                        total_symbol += 1
+            # If button is over the reset button it stops highlighting the mode buttons.
+            self.board.mode_hover = "none"
 
-                    elif self.board.moves[(diagonal * 2) + (intercept * 2)] != opposing_symbol:
-                        missing_symbol.append((diagonal * 2) + (intercept * 2))
+        # If nothing is being hovered over the highlighting stops.
+        else:
+            self.board.mode_hover = "none"
+            self.board.reset_hover = "none"
 
-            if (total_symbol == 2) & (len(missing_symbol) > 0):
-                return int(missing_symbol[0] + 1)
 
-        return 0
+# Game class runs the window. It waits for events instead of checking the mouse all the time, and robot moves and
+# the pause after a game are timers, so the window keeps responding while they wait.
+class Game:
+
+    # Initiates the objects.
+    def __init__(self, arguments):
+        self.scheduler = Scheduler()
+        self.score = Scoreboard()
+        self.score_store = None
+
+        # Carries on from the score saved in the file and records every result to it.
+        if arguments.scores is not None:
+            import scorestore
+            self.score_store = scorestore.ScoreStore(arguments.scores, fsync_interval=arguments.fsync_interval)
+            self.score_store.load(self.score)
+
+        board_class = load_ultimate() if arguments.ultimate else GameBoard
+        self.board = board_class(self.score, self.scheduler, rows=arguments.rows, columns=arguments.columns, k=arguments.k)
+        self.board.robot = arguments.robot
+        # fallback is the cheap strategy played if the robot is still thinking at its deadline (in milliseconds).
+        self.fallback = "random_move" if arguments.ultimate else "intelligent_move"
+        self.deadline = int(arguments.robot_deadline * 1000)
+        # The robot thinks on one background thread, so the window keeps drawing. Only one decision is worked out at
+        # a time, because the robots keep their searches in objects shared by every move. concurrent.futures is only
+        # imported here, since it takes longer to import than the rest of this file.
+        import concurrent.futures
+        self.executor = concurrent.futures.ThreadPoolExecutor(1)
+        self.decision_event = pygame.event.custom_type()
+
+        if arguments.log is not None:
+            self.board.log = gamelog.GameLog(arguments.log)
+
+        self.interface = BoardUI(self.board, self.score, arguments.layered)
+        self.x_player = Player(self.board, self.interface, "x")
+        self.o_player = Player(self.board, self.interface, "o")
+        self.fps = arguments.fps
+        self.clock = pygame.time.Clock()
+        self.mouse_position = pygame.mouse.get_pos()
+        # robot_ready is True once the robot's pause is over, so its move can be played as soon as it is decided.
+        self.robot_ready = False
+        self.running = True
+        # input_time is when the first input that hasn't been painted yet was handled, used by the metrics.
+        self.input_time = None
+
+        if metrics.active is not None:
+            metrics.active.watch(self.score)
+
+    # robot_turn method checks if it is a robot's turn, in "rvr" mode and for o in "pvr" mode.
+    def robot_turn(self):
+        return (self.board.mode == "rvr") | ((self.board.mode == "pvr") & (self.board.current_symbol == "o"))
+
+    # input_player method returns the player the mouse is used by and if they can click on squares.
+    # In "pvp" mode it is whoever's turn it is, otherwise it is x. Only buttons work when it isn't a person's turn.
+    def input_player(self):
+        squares = (self.board.mode != "menu") & (not self.robot_turn()) & (not self.board.game_over)
+
+        if (self.board.mode == "pvp") & (self.board.current_symbol == "o"):
+            return self.o_player, squares
+
+        return self.x_player, squares
+
+    # robot_player method returns the player whose turn it is.
+    def robot_player(self):
+        return self.x_player if self.board.current_symbol == "x" else self.o_player
+
+    # start_decision method starts the robot working out its move on a copy of the board in the background. The move
+    # is played once it is decided and the half second pause is over, or the fallback move is played at the deadline.
+    def start_decision(self):
+        decision = self.executor.submit(engine.decide, self.board.robot, self.board.copy(), self.board.current_symbol)
+        self.board.decision = decision
+        self.robot_ready = False
+
+        # The main loop is woken up when the move is decided. Posting an event is safe from the robot's thread.
+        decision.add_done_callback(lambda future: pygame.event.post(pygame.event.Event(self.decision_event)))
+        self.board.decision_timers = [self.scheduler.call_later(500, lambda: self.robot_move(decision)),
+                                      self.scheduler.call_later(self.deadline, lambda: self.robot_timeout(decision))]
+
+    # robot_move method is called when the robot's pause is over, if the decision hasn't been cancelled since.
+    def robot_move(self, decision):
+
+        if decision is self.board.decision:
+            self.robot_ready = True
+            self.play_decision()
+
+    # play_decision method plays the robot's move if it has been decided and the pause is over, otherwise the robot is
+    # shown as thinking.
+    def play_decision(self):
+        decision = self.board.decision
+
+        if (decision is None) or (not self.robot_ready):
+            return
+
+        if not decision.done():
+            self.board.thinking = True
+            return
+
+        self.board.cancel_decision()
+
+        if self.robot_turn() & (not self.board.game_over):
+            self.robot_player().make_move(decision.result())
+
+    # robot_timeout method plays the fallback move if the robot still hasn't decided at its deadline.
+    def robot_timeout(self, decision):
+
+        if (decision is self.board.decision) and (not decision.done()):
+            self.board.cancel_decision()
+
+            if self.robot_turn() & (not self.board.game_over):
+                self.robot_player().strategy_move(self.fallback)
+
+    # handle_event method gives the mouse events to the player and stops the game if the exit button is clicked.
+    def handle_event(self, event):
 
-    # intelligent_move method is used by the robot to decide its move.
-    def intelligent_move(self):
-        opposing_symbol = self.opposite_symbol(self.symbol)
-        attack_move = self.one_off_win(self.symbol)
-        block_move = self.one_off_win(opposing_symbol)
-        # Firstly checks if the middle square is empty, so it can take it first.
-        if 5 in self.board.possible_moves:
-            self.make_move(5)
-            pygame.time.wait(500)
-
-        # Secondly checks if it is one square off of a win and does so.
-        elif attack_move != 0:
-
-            if self.check_move(attack_move):
-                self.make_move(attack_move)
-
-        # Thirdly checks if the enemy is one square off of a win and does so.
-        elif block_move != 0:
-            if self.check_move(block_move):
-                self.make_move(block_move)
-
-        # If all the conditions above are not true it places a random move.
-        else:
-            self.random_move()
+        if event.type == pygame.QUIT:
+            self.running = False
 
-    # cursor method provides functionality to the cursor to know where it is hovering and clicking over.
-    def cursor(self, position, hover):
-        x_position = position[0]
-        y_position = position[1]
-        square = 0
+        elif event.type == self.decision_event:
+            self.play_decision()
 
-        # If the mode is not "menu" it allows the user to click on any square.
-        if self.board.mode != "menu":
+        elif event.type == pygame.MOUSEMOTION:
+            self.mouse_position = event.pos
+            self.mark_input()
 
-            # Square 1
-            if (x_position < 300 / self.boardUI.offset) & (x_position > 0) & (y_position < 300 / self.boardUI.offset) & (y_position > 0):
-                square = 1
+        elif (event.type == pygame.MOUSEBUTTONDOWN) and (event.button == 1):
+            self.mouse_position = event.pos
+            self.mark_input()
+            player, squares = self.input_player()
+            player.cursor(event.pos, False, squares)
 
-            # Square 2
-            elif (x_position < 600 / self.boardUI.offset) & (x_position > 300 / self.boardUI.offset) & (y_position < 300 / self.boardUI.offset) & (y_position > 0):
-                square = 2
+    # mark_input method remembers when input was handled, so the time until it is painted can be measured.
+    def mark_input(self):
 
-            # Square 3
-            elif (x_position < 900 / self.boardUI.offset) & (x_position > 600 / self.boardUI.offset) & (y_position < 300 / self.boardUI.offset) & (y_position > 0):
-                square = 3
+        if (metrics.active is not None) and (self.input_time is None):
+            self.input_time = time.perf_counter()
 
-            # Square 4
-            elif (x_position < 300 / self.boardUI.offset) & (x_position > 0) & (y_position < 600 / self.boardUI.offset) & (y_position > 300 / self.boardUI.offset):
-                square = 4
+    # draw_frame method draws the frame, with the hovering symbol or button for wherever the mouse is.
+    # If metrics are turned on it records how long the frame took and how long since the input it is showing.
+    def draw_frame(self):
+        start = None if metrics.active is None else time.perf_counter()
+        self.interface.thinking = self.board.thinking
+        player, squares = self.input_player()
+        player.highlight(self.mouse_position)
+        self.interface.load_symbols()
+        player.cursor(self.mouse_position, True, squares)
+        self.interface.show()
 
-            # Square 5
-            elif (x_position < 600 / self.boardUI.offset) & (x_position > 300 / self.boardUI.offset) & (y_position < 600 / self.boardUI.offset) & (y_position > 300 / self.boardUI.offset):
-                square = 5
+        if start is not None:
+            end = time.perf_counter()
+            metrics.active.observe("frame_render_seconds", end - start)
 
-            # Square 6
-            elif (x_position < 900 / self.boardUI.offset) & (x_position > 600 / self.boardUI.offset) & (y_position < 600 / self.boardUI.offset) & (y_position > 300 / self.boardUI.offset):
-                square = 6
+            if self.input_time is not None:
+                metrics.active.observe("input_to_paint_seconds", end - self.input_time)
+                self.input_time = None
 
-            # Square 7
-            elif (x_position < 300 / self.boardUI.offset) & (x_position > 0) & (y_position < 900 / self.boardUI.offset) & (y_position > 600 / self.boardUI.offset):
-                square = 7
+            metrics.active.maybe_flush()
 
-            # Square 8
-            elif (x_position < 600 / self.boardUI.offset) & (x_position > 300 / self.boardUI.offset) & (y_position < 900 / self.boardUI.offset) & (y_position > 600 / self.boardUI.offset):
-                square = 8
+    # run method is the main loop, done until the exit button is clicked.
+    def run(self):
+        self.draw_frame()
 
-            # Square 9
-            elif (x_position < 900 / self.boardUI.offset) & (x_position > 600 / self.boardUI.offset) & (y_position < 900 / self.boardUI.offset) & (y_position > 600 / self.boardUI.offset):
-                square = 9
+        while self.running:
 
-            # If cursor is hovering over a playable tile a cursor symbol is placed over it.
-            if (square != 0) & hover & self.check_move(square):
-                self.boardUI.place(hover, self.symbol, square - 1)
+            # The robot starts thinking as soon as it is its turn, but always waits half a second before it moves,
+            # so you can see what it is doing.
+            if (self.board.decision is None) & self.robot_turn() & (not self.board.game_over):
+                self.start_decision()
 
-            # If it is a valid move it is placed.
-            elif (square != 0) & self.check_move(square):
-                self.board.new_move(square, self.symbol)
+            # Sleeps until there is an event if nothing is waiting, otherwise until the next timer is due. A timer that
+            # is already due doesn't wait at all, since pygame.event.wait(0) would wait for an event instead.
+            delay = self.scheduler.time_until_next()
 
-        # Checks if cursor is above the "pvp" mode button.
-        if (x_position < 1000 / self.boardUI.offset) & (x_position > 900 / self.boardUI.offset) & (y_position < 300 / self.boardUI.offset) & (y_position > 0) & (self.board.mode != "pvp"):
+            if delay is None:
+                events = [pygame.event.wait()]
 
-            # Provides functionality if clicked.
-            if not hover:
-                self.board.points.reset()
-                self.boardUI.draw_board()
-                self.board.mode = "pvp"
-                self.board.new_game()
+            elif delay == 0:
+                events = []
 
-            # Highlights the button if hovered over.
             else:
-                self.board.mode_hover = "pvp"
-                self.boardUI.draw_board()
-                self.boardUI.load_symbols()
+                events = [pygame.event.wait(delay)]
 
-        # Checks if the cursor is above the "pvr" mode button.
-        elif (x_position < 1000 / self.boardUI.offset) & (x_position > 900 / self.boardUI.offset) & (y_position < 600 / self.boardUI.offset) & (y_position > 300 / self.boardUI.offset) & (self.board.mode != "pvr"):
+            for event in events + pygame.event.get():
+                self.handle_event(event)
 
-            # Provides functionality if clicked.
-            if not hover:
-                self.board.points.reset()
-                self.boardUI.draw_board()
-                self.board.mode = "pvr"
-                self.board.new_game()
-                self.boardUI.draw_board()
-                self.boardUI.load_symbols()
+            self.scheduler.run_due()
 
-            # Highlights the button if hovered over.
-            else:
-                self.board.mode_hover = "pvr"
-                self.boardUI.draw_board()
-                self.boardUI.load_symbols()
+            # Loads graphics.
+            self.draw_frame()
 
-            # Stops highlighting the reset button.
-            self.board.reset_hover = "none"
+            # Stops the game from drawing more than the target frames per second.
+            self.clock.tick(self.fps)
 
-        # Checks if the cursor is above the "rvr" mode button.
-        elif (x_position < 1000 / self.boardUI.offset) & (x_position > 900 / self.boardUI.offset) & (y_position < 900 / self.boardUI.offset) & (y_position > 600 / self.boardUI.offset) & (self.board.mode != "rvr"):
 
-            # Provides functionality if clicked.
-            if not hover:
-                self.board.points.reset()
-                self.boardUI.draw_board()
-                self.board.mode = "rvr"
-                self.board.new_game()
-                self.boardUI.load_symbols()
+# main function starts the game. Nothing is started when this file is imported, so the classes can be used by other
+# programs like the benchmarks. The other robots are only imported here, since most of them take time to import.
+def main():
+    import mcts
+    import scorestore
+    import search  # Adds perfect_move to the strategies.
+    import solved_table  # Adds table_move to the strategies.
+    import ultimate  # Adds ultimate_move to the strategies.
 
-            # Highlights the button if hovered over.
-            else:
-                self.board.mode_hover = "rvr"
-                self.boardUI.draw_board()
-                self.boardUI.load_symbols()
+    # Reads the size of the board, which is 3x3 with three in a row unless it is changed.
+    parser = argparse.ArgumentParser(description="Tic-Tac-Toe")
+    parser.add_argument("--rows", type=int, default=3, help="number of rows on the board")
+    parser.add_argument("--columns", type=int, default=3, help="number of columns on the board")
+    parser.add_argument("--k", type=int, default=3, help="how many in a row wins")
+    parser.add_argument("--layered", action="store_true", help="only redraw the parts of the window that change")
+    parser.add_argument("--fps", type=int, default=60, help="most frames drawn a second")
+    parser.add_argument("--metrics", default=None, help="file the metrics are written to, they are off if not given")
+    parser.add_argument("--metrics-interval", type=float, default=10.0, help="seconds between writing the metrics")
+    parser.add_argument("--log", default=None, help="game log every finished game is appended to (3x3 only)")
+    parser.add_argument("--scores", default=None, help="file the score is saved to and loaded from")
+    parser.add_argument("--fsync-interval", type=float, default=scorestore.FSYNC_INTERVAL,
+                        help="most seconds of scores that can be lost if the computer loses power")
+    parser.add_argument("--ultimate", action="store_true", help="play ultimate tic-tac-toe, a 3x3 board of 3x3 boards")
+    parser.add_argument("--robot", choices=engine.STRATEGIES, default=None,
+                        help="strategy of the robot (default: intelligent_move, or ultimate_move for --ultimate)")
+    parser.add_argument("--robot-deadline", type=float, default=5.0,
+                        help="seconds the robot can think before a quick move is played instead, "
+                             "--mcts-time is cut down to fit in it")
+    parser.add_argument("--mcts-time", type=float, default=mcts.TIME_BUDGET, help="seconds mcts_move thinks a move")
+    parser.add_argument("--mcts-iterations", type=int, default=None, help="most games mcts_move plays a move")
+    parser.add_argument("--mcts-workers", type=int, default=1, help="processes mcts_move searches with")
+    arguments = parser.parse_args()
 
-            # Stops highlighting the reset button.
-            self.board.reset_hover = "none"
+    standard = ((arguments.rows, arguments.columns, arguments.k) == (3, 3, 3)) & (not arguments.ultimate)
 
-        # Checks if the cursor is above the reset button.
-        elif (x_position < 1000 / self.boardUI.offset) & (x_position > 900 / self.boardUI.offset) & (y_position < 1000 / self.boardUI.offset) & (y_position > 900 / self.boardUI.offset):
+    if arguments.robot is None:
+        arguments.robot = "ultimate_move" if arguments.ultimate else "intelligent_move"
 
-            # Provides functionality if clicked.
-            if not hover:
-                self.board.points.reset()
-                self.board.new_game()
+    if arguments.ultimate & (arguments.robot not in ultimate.STRATEGIES):
+        parser.error(f"--ultimate only works with the {' and '.join(ultimate.STRATEGIES)} robots")
 
-            # Highlights the button if hovered over.
-            else:
-                self.board.reset_hover = "reset"
-                self.boardUI.draw_board()
-                self.boardUI.load_symbols()
+    if (not arguments.ultimate) & (arguments.robot == "ultimate_move"):
+        parser.error("ultimate_move only works with --ultimate")
 
-            # If button is over the reset button it stops highlighting the mode buttons.
-            self.board.mode_hover = "none"
+    if arguments.fsync_interval <= 0:
+        parser.error("--fsync-interval has to be more than 0")
 
-        # If nothing is being hovered over the highlighting stops.
-        else:
-            self.board.mode_hover = "none"
-            self.board.reset_hover = "none"
+    if (arguments.log is not None) & (not standard):
+        parser.error("--log only works on the 3x3 board")
 
+    error = engine.size_error([arguments.robot], arguments.rows, arguments.columns, arguments.k)
 
-# Initiates the objects.
-score = Scoreboard()
-board1 = Board(score)
-pygame.init()
-interface = BoardUI(board1, score)
-interface.draw_board()
-interface.load_symbols()
-running = True
-x_player = Player(board1, interface, "x")
-o_player = Player(board1, interface, "o")
+    if error is not None:
+        parser.error(error)
 
-# Every line in the loop is being done repeatedly until the exit button is clicked.
-while running:
+    # The search robots are given less time than the deadline, so they finish before the quick move is played.
+    mcts.searcher.time_budget = min(arguments.mcts_time, DEADLINE_SHARE * arguments.robot_deadline)
+    ultimate.searcher.time_budget = min(ultimate.SEARCH_TIME, DEADLINE_SHARE * arguments.robot_deadline)
+    mcts.searcher.iterations = arguments.mcts_iterations
+    mcts.searcher.workers = arguments.mcts_workers
 
-    # Checks if the exit button has been clicked.
-    for event in pygame.event.get():
+    if arguments.metrics is not None:
+        metrics.enable(arguments.metrics, arguments.metrics_interval)
 
-        if event.type == pygame.QUIT:
-            running = False
-
-    interface.load_symbols()
-
-    # Provides functionality if the game is in menu mode.
-    if board1.mode == "menu":
-        # Track the mouse to know what it is hovering over.
-        x_player.cursor(pygame.mouse.get_pos(), True)
-
-        # Provides functionality if mouse is clicked.
-        if pygame.mouse.get_pressed()[0]:
-            x_player.cursor(pygame.mouse.get_pos(), False)
-            interface.draw_board()
-            interface.load_symbols()
-
-    # If the game is not in menu mode it provides functionality to the player to place pieces.
-    else:
-
-        # Gives the x player functionality when in "pvp" and "pvr" modes.
-        if ((board1.mode == "pvp") | (board1.mode == "pvr")) & (board1.current_symbol == "x"):
-
-            if board1.current_symbol == "x":
-                # Tracks the mouse to know what it is hovering over.
-                x_player.cursor(pygame.mouse.get_pos(), True)
-
-                # Provides functionality if the mouse is clicked.
-                if pygame.mouse.get_pressed()[0]:
-                    x_player.cursor(pygame.mouse.get_pos(), False)
-                    interface.draw_board()
-                    interface.load_symbols()
-                    pygame.time.wait(500)
-
-        # If the mode is "rvr" or "pvr" the x player robot makes its move.
-        elif (board1.mode == "rvr") & (board1.current_symbol == "x"):
-            x_player.intelligent_move()
-            pygame.time.wait(500)
-
-        # Gives the o player functionality when in "pvp" mode.
-        elif (board1.mode == "pvp") & (board1.current_symbol == "o"):
-            # Tracks the mouse to know what it is hovering over.
-            o_player.cursor(pygame.mouse.get_pos(), True)
-
-            # Provides functionality if mouse is clicked.
-            if pygame.mouse.get_pressed()[0]:
-                o_player.cursor(pygame.mouse.get_pos(), False)
-                interface.draw_board()
-                interface.load_symbols()
-                pygame.time.wait(500)
-
-        # If the mode is "rvr" or "pvr" the o player robot makes its move.
-        elif ((board1.mode == "pvr") | (board1.mode == "rvr")) & (board1.current_symbol == "o"):
-            o_player.intelligent_move()
-            pygame.time.wait(500)
-
-    # Loads graphics.
-    pygame.display.flip()
-
-# If the exit button has been clicked the program terminates.
-pygame.quit()
+    load_pygame().init()
+    game = Game(arguments)
+    game.run()
+    game.executor.shutdown(wait=False, cancel_futures=True)
+
+    if game.board.log is not None:
+        game.board.log.close()
+
+    if game.score_store is not None:
+        game.score_store.close()
+
+    mcts.searcher.close()
+
+    # If the exit button has been clicked the program terminates.
+    metrics.disable()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Project: Tic-Tac-Toe
+Description: Plays a batch of "rvr" games between two robot strategies using every core on the computer.
+             Each worker gets its own seed so the same command always gives the same tally.
+Usage: python tournament.py intelligent_move random_move --games 1000000
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import time
+
+import gamelog
+import mcts  # Adds mcts_move to the strategies.
+import search  # Adds perfect_move to the strategies.
+import solved_table  # Adds table_move to the strategies.
+from engine import STRATEGIES, Scoreboard, play_game, size_error
+
+
+# play_batch plays a number of games in one worker and returns that worker's scoreboard. If log_path is given every
+# game is appended to the game log there. mcts_budget is the seconds and iterations mcts_move gets a move.
+def play_batch(x_strategy, o_strategy, games, seed, size=(3, 3, 3), log_path=None,
+               mcts_budget=(mcts.TIME_BUDGET, None)):
+    random.seed(seed)
+    mcts.searcher.generator.seed(seed)
+    mcts.searcher.time_budget, mcts.searcher.iterations = mcts_budget
+    points = Scoreboard()
+    log = None if log_path is None else gamelog.GameLog(log_path)
+
+    for _ in range(games):
+        play_game(x_strategy, o_strategy, points, *size, log=log)
+
+    if log is not None:
+        log.close()
+
+    return points
+
+
+# run_tournament splits the games evenly over the workers and merges every worker's scoreboard into one.
+# Worker i is seeded with seed + i, so the results only depend on the seed and the number of workers.
+# size is the rows, columns and k of the board. If log_path is given every game is appended to the game log there,
+# each worker writes its own part which is added to the log once they are all done.
+def run_tournament(x_strategy, o_strategy, games, workers=None, seed=0, size=(3, 3, 3), log_path=None,
+                   mcts_budget=(mcts.TIME_BUDGET, None)):
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    workers = max(1, min(workers, games))
+    part_paths = [None] * workers
+
+    if log_path is not None:
+        part_paths = [f"{log_path}.part{worker}" for worker in range(workers)]
+
+        # A part left by a run that was stopped holds games that aren't part of this run, so it is started again.
+        for part_path in part_paths:
+
+            if os.path.exists(part_path):
+                os.remove(part_path)
+
+    batches = [(x_strategy, o_strategy, (games // workers) + (worker < games % workers), seed + worker,
+                size, part_paths[worker], mcts_budget) for worker in range(workers)]
+
+    # Runs in this process if there is only one worker, so there is no cost of starting a pool.
+    if workers == 1:
+        results = [play_batch(*batches[0])]
+
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            results = pool.starmap(play_batch, batches)
+
+    points = Scoreboard()
+
+    for result in results:
+        points.merge(result)
+
+    if log_path is not None:
+
+        for part_path in part_paths:
+            gamelog.append_log(part_path, log_path)
+            os.remove(part_path)
+
+    return points
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plays a batch of robot vs robot games.")
+    parser.add_argument("x_strategy", choices=STRATEGIES, help="strategy used by the x robot")
+    parser.add_argument("o_strategy", choices=STRATEGIES, help="strategy used by the o robot")
+    parser.add_argument("--games", type=int, default=10000, help="number of games to play")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="seed given to the first worker")
+    parser.add_argument("--rows", type=int, default=3, help="number of rows on the board")
+    parser.add_argument("--columns", type=int, default=3, help="number of columns on the board")
+    parser.add_argument("--k", type=int, default=3, help="how many in a row wins")
+    parser.add_argument("--log", default=None, help="game log every game is appended to (3x3 only)")
+    parser.add_argument("--mcts-time", type=float, default=mcts.TIME_BUDGET, help="seconds mcts_move thinks a move")
+    parser.add_argument("--mcts-iterations", type=int, default=None, help="most games mcts_move plays a move")
+    args = parser.parse_args()
+
+    if args.log is not None and (args.rows, args.columns, args.k) != (3, 3, 3):
+        parser.error("--log only works on the 3x3 board")
+
+    error = size_error([args.x_strategy, args.o_strategy], args.rows, args.columns, args.k)
+
+    if error is not None:
+        parser.error(error)
+
+    start = time.perf_counter()
+    points = run_tournament(args.x_strategy, args.o_strategy, args.games, args.workers, args.seed,
+                            (args.rows, args.columns, args.k), args.log, (args.mcts_time, args.mcts_iterations))
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.x_strategy} (x) vs {args.o_strategy} (o), {points.total_games()} games")
+    print(f"x : {points.x_score}  o : {points.o_score}  d : {points.draw}")
+    print(f"{points.total_games() / elapsed:.0f} games/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+"""
+Project: Tic-Tac-Toe
+Description: Ultimate tic-tac-toe, a 3x3 board of 3x3 boards. The square you play in a small board sends the other
+             player to the small board in the same place, or anywhere if that board is already finished. Winning a
+             small board claims its square on the big board, and three in a row on the big board wins the game.
+             Each small board is kept as a 9-bit mask for each symbol, and only the small board that was played in
+             and the big board lines through it are checked after a move.
+             The board is shown and played as a 9x9 grid, square 1 being the top left, so the window and the
+             Scoreboard work with it like any other board.
+"""
+import random
+import time
+
+import engine
+from engine import WIN_MASKS, Board, Scoreboard
+
+# SQUARES maps a small board and a square in it (both 0 to 8) to the square (0 to 80) on the 9x9 grid, and
+# SUB_CELLS maps the other way.
+SQUARES = [[(sub // 3 * 3 + cell // 3) * 9 + sub % 3 * 3 + cell % 3 for cell in range(9)] for sub in range(9)]
+SUB_CELLS = [None] * 81
+
+for sub in range(9):
+
+    for cell in range(9):
+        SUB_CELLS[SQUARES[sub][cell]] = (sub, cell)
+
+# CELL_MASKS lists the winning lines through each square of a 3x3 board, and CELLS lists the squares set in every
+# 9-bit mask, so the empty squares of a small board are found with one lookup.
+CELL_MASKS = [[mask for mask, line in WIN_MASKS if mask >> cell & 1] for cell in range(9)]
+CELLS = [tuple(cell for cell in range(9) if bits >> cell & 1) for bits in range(512)]
+FULL = 0b111111111
+
+# SEARCH_TIME is how many seconds ultimate_move thinks a move, and WIN the score of a won game.
+SEARCH_TIME = 0.2
+WIN = 100000
+
+# LINE_SCORES scores a big board line that only one player can still win by how many small boards they have on it.
+# SUB_SCORES scores the small boards a player has won by where they are (centre, then corners, then edges) and
+# PAIRS counts the lines a small board mask has two squares on, which is how close it is to winning that board.
+LINE_SCORES = [0, 20, 200, WIN]
+SQUARE_SCORES = [6, 4, 6, 4, 9, 4, 6, 4, 6]
+SUB_SCORES = [sum(SQUARE_SCORES[sub] for sub in CELLS[bits]) for bits in range(512)]
+PAIRS = [sum((bits & mask).bit_count() == 2 for mask, line in WIN_MASKS) for bits in range(512)]
+
+
+# UltimateBoard class is the board for ultimate tic-tac-toe. It has the same methods and attributes the window and
+# the Scoreboard use on a Board, so it is used the same way, and the Board's win, undo and redo work on it.
+class UltimateBoard(Board):
+
+    # Initiates the empty board.
+    def __init__(self, points, verbose=True, **options):
+        self.rows = 9
+        self.columns = 9
+        self.k = 3
+        self.size = 81
+        self.standard = False
+        # The lines of the 9x9 grid aren't kept, only the masks of the small boards, so the strategies that need
+        # them turn this board down instead of reading attributes it doesn't have.
+        self.bitboard = False
+        self.nested = True
+        self.zobrist = engine.zobrist_keys(81)
+        self.verbose = verbose
+        self.total_games = 0
+        self.last_result = None
+        self.log = None
+        self.strategy_names = {"x": "human", "o": "human"}
+        self.points = points
+        self.mode = "pvp"
+        self.mode_hover = "none"
+        self.reset_hover = "none"
+        self.current_symbol = "x"
+        self.reset()
+
+    # reset method makes the board empty. This does not change the score.
+    def reset(self):
+        # moves is the 9x9 grid the window draws. cells holds each symbol's mask on every small board and
+        # sub_winners who finished each small board ("x", "o", "d" for a draw or None). meta holds the small boards
+        # each symbol has won as a mask, and finished the ones that are over.
+        self.moves = [" "] * 81
+        self.cells = {"x": [0] * 9, "o": [0] * 9}
+        self.sub_winners = [None] * 9
+        self.meta = {"x": 0, "o": 0}
+        self.finished = 0
+        # next_board is the small board the next move has to be in, or None if it can be anywhere. winner is who won
+        # the whole game, set by the move that finished it.
+        self.next_board = None
+        self.winner = None
+        self.history = []
+        self.next_boards = []
+        self.redo_moves = []
+        self.hash = 0
+        self.total_moves = 0
+
+    # copy method returns a copy of the position, without the score, for robots to search on.
+    def copy(self):
+        board = UltimateBoard(Scoreboard(), verbose=False)
+        board.moves = list(self.moves)
+        board.cells = {"x": list(self.cells["x"]), "o": list(self.cells["o"])}
+        board.sub_winners = list(self.sub_winners)
+        board.meta = dict(self.meta)
+        board.finished = self.finished
+        board.next_board = self.next_board
+        board.winner = self.winner
+        board.history = list(self.history)
+        board.next_boards = list(self.next_boards)
+        board.hash = self.hash
+        board.total_moves = self.total_moves
+        board.current_symbol = self.current_symbol
+        return board
+
+    # is_legal method checks if the square (1 to 81) can be played next.
+    def is_legal(self, move):
+
+        if (not 1 <= move <= 81) or (self.winner is not None):
+            return False
+
+        sub, cell = SUB_CELLS[move - 1]
+
+        if (self.next_board is not None) and (self.next_board != sub):
+            return False
+
+        return not ((self.finished >> sub) & 1) and not ((self.cells["x"][sub] | self.cells["o"][sub]) >> cell) & 1
+
+    # legal_moves method returns every square (1 to 81) that can be played next.
+    def legal_moves(self):
+
+        if self.winner is not None:
+            return []
+
+        if self.next_board is None:
+            subs = [sub for sub in range(9) if not (self.finished >> sub) & 1]
+
+        else:
+            subs = [self.next_board]
+
+        x_cells = self.cells["x"]
+        o_cells = self.cells["o"]
+        return [SQUARES[sub][cell] + 1 for sub in subs for cell in CELLS[FULL & ~(x_cells[sub] | o_cells[sub])]]
+
+    # possible_moves are the legal moves, so strategies like random_move work on this board too.
+    @property
+    def possible_moves(self):
+        return self.legal_moves()
+
+    # place method puts the symbol on the square and updates the small board it is in, and the big board if that
+    # small board is won, without changing whose turn it is. Search robots use it with unplace.
+    def place(self, move, symbol):
+        sub, cell = SUB_CELLS[move - 1]
+        self.moves[move - 1] = symbol
+        self.history.append(move)
+        self.next_boards.append(self.next_board)
+        self.hash ^= self.zobrist[symbol][move - 1]
+        self.total_moves += 1
+        pieces = self.cells[symbol][sub] | (1 << cell)
+        self.cells[symbol][sub] = pieces
+
+        # Only the lines through the square that was played can have been won.
+        for mask in CELL_MASKS[cell]:
+
+            if pieces & mask == mask:
+                self.sub_winners[sub] = symbol
+                self.finished |= 1 << sub
+                meta = self.meta[symbol] | (1 << sub)
+                self.meta[symbol] = meta
+
+                for meta_mask in CELL_MASKS[sub]:
+
+                    if meta & meta_mask == meta_mask:
+                        self.winner = symbol
+
+                break
+
+        else:
+
+            if pieces | self.cells[engine.opposite_symbol(symbol)][sub] == FULL:
+                self.sub_winners[sub] = "d"
+                self.finished |= 1 << sub
+
+        if (self.winner is None) and (self.finished == FULL):
+            self.winner = "d"
+
+        self.next_board = None if (self.finished >> cell) & 1 else cell
+
+    # unplace method takes the last piece played off the board and puts back everything place changed, returning its
+    # square and symbol. It doesn't change whose turn it is.
+    def unplace(self):
+        move = self.history.pop()
+        sub, cell = SUB_CELLS[move - 1]
+        symbol = self.moves[move - 1]
+        self.moves[move - 1] = " "
+        self.cells[symbol][sub] &= ~(1 << cell)
+        self.hash ^= self.zobrist[symbol][move - 1]
+        self.total_moves -= 1
+
+        # Nothing can be played in a finished small board, so if it is finished this move finished it.
+        if self.sub_winners[sub] is not None:
+
+            if self.sub_winners[sub] != "d":
+                self.meta[symbol] &= ~(1 << sub)
+
+            self.sub_winners[sub] = None
+            self.finished &= ~(1 << sub)
+
+        self.winner = None
+        self.next_board = self.next_boards.pop()
+        return move, symbol
+
+    # new_move method plays the move, gives the result to the Scoreboard if it finished the game, and swaps what
+    # players turn it is.
+    def new_move(self, move, symbol):
+
+        if self.redo_moves:
+            self.redo_moves = []
+
+        self.place(move, symbol)
+
+        if self.winner is not None:
+            self.win(self.winner)
+
+        match self.current_symbol:
+
+            case "x":
+                self.current_symbol = "o"
+
+            case "o":
+                self.current_symbol = "x"
+
+    # evaluate method scores the position for the symbol, higher being better. It looks at the big board lines
+    # each player can still win, the small boards they have won and how close they are to winning the others.
+    def evaluate(self, symbol):
+        opposing_symbol = engine.opposite_symbol(symbol)
+        mine = self.meta[symbol]
+        theirs = self.meta[opposing_symbol]
+        drawn = self.finished & ~(mine | theirs)
+        score = SUB_SCORES[mine] - SUB_SCORES[theirs]
+
+        for mask, line in WIN_MASKS:
+
+            if not mask & (theirs | drawn):
+                score += LINE_SCORES[(mask & mine).bit_count()]
+
+            if not mask & (mine | drawn):
+                score -= LINE_SCORES[(mask & theirs).bit_count()]
+
+        my_cells = self.cells[symbol]
+        their_cells = self.cells[opposing_symbol]
+
+        for sub in CELLS[FULL & ~self.finished]:
+            score += PAIRS[my_cells[sub]] - PAIRS[their_cells[sub]]
+
+        return score
+
+
+# UltimateSearcher class picks moves by negamax search with alpha-beta pruning. It searches one ply deeper at a time
+# until its time runs out and plays the best move of the deepest search it finished.
+class UltimateSearcher:
+
+    # Initiates the searcher with the seconds it has for every move and the deepest it will search.
+    def __init__(self, time_budget=SEARCH_TIME, max_depth=12):
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.deadline = None
+        self.stopped = False
+        # stopping is set by stop to end the search early, it is cleared when the next move starts.
+        self.stopping = False
+        self.nodes = 0
+        self.depth = 0
+
+    # negamax method returns the value of the position for the symbol to move, searching depth more moves.
+    def negamax(self, board, symbol, depth, alpha, beta, ply):
+
+        # The last move finished the game, so it was the other player's.
+        if board.winner is not None:
+            return 0 if board.winner == "d" else ply - WIN
+
+        if depth == 0:
+            return board.evaluate(symbol)
+
+        self.nodes += 1
+
+        if (self.nodes & 255 == 0) and (self.stopping or (time.perf_counter() >= self.deadline)):
+            self.stopped = True
+
+        if self.stopped:
+            return 0
+
+        opposing_symbol = engine.opposite_symbol(symbol)
+        best = -WIN - 1
+
+        for move in board.legal_moves():
+            board.place(move, symbol)
+            value = -self.negamax(board, opposing_symbol, depth - 1, -beta, -alpha, ply + 1)
+            board.unplace()
+
+            if value > best:
+                best = value
+
+            if best > alpha:
+                alpha = best
+
+            if alpha >= beta:
+                break
+
+        return best
+
+    # best_move method returns the square (1 to 81) to play for the symbol.
+    def best_move(self, board, symbol):
+        self.stopping = False
+        board = board.copy()
+        moves = board.legal_moves()
+        random.shuffle(moves)
+        best_move = moves[0]
+        self.deadline = time.perf_counter() + self.time_budget
+        self.stopped = False
+        self.nodes = 0
+        opposing_symbol = engine.opposite_symbol(symbol)
+
+        for depth in range(1, self.max_depth + 1):
+            alpha = -WIN - 1
+            depth_best = None
+
+            for move in moves:
+                board.place(move, symbol)
+                value = -self.negamax(board, opposing_symbol, depth - 1, -WIN - 1, -alpha, 1)
+                board.unplace()
+
+                if self.stopped:
+                    break
+
+                if value > alpha:
+                    alpha = value
+                    depth_best = move
+
+            # A search that ran out of time is only half done, so its answer isn't used.
+            if self.stopped:
+                break
+
+            best_move = depth_best
+            self.depth = depth
+
+            # The best move is tried first next time, which makes the pruning work better.
+            moves.remove(best_move)
+            moves.insert(0, best_move)
+
+            if abs(alpha) >= WIN - self.max_depth:
+                break
+
+        return best_move
+
+    # stop method makes the running search return at its next check of the clock. It can be called from another
+    # thread.
+    def stop(self):
+        self.stopping = True
+
+
+# searcher is shared by every ultimate_move call in this process.
+searcher = UltimateSearcher()
+engine.SEARCHERS.append(searcher)
+
+
+# ultimate_move strategy plays the move the shared searcher finds. It only works on an UltimateBoard.
+def ultimate_move(board, symbol):
+    return searcher.best_move(board, symbol)
+
+
+engine.STRATEGIES["ultimate_move"] = ultimate_move
+
+# STRATEGIES lists the strategies that can play on an UltimateBoard.
+STRATEGIES = ["random_move", "ultimate_move"]
+
+
+# play_game plays one whole game of ultimate tic-tac-toe between two strategies and returns the result, 'x', 'o' or
+# 'd' (draw), like engine.play_game does.
+def play_game(x_strategy, o_strategy, points=None):
+
+    if points is None:
+        points = Scoreboard()
+
+    strategies = {"x": engine.STRATEGIES.get(x_strategy, x_strategy), "o": engine.STRATEGIES.get(o_strategy, o_strategy)}
+    board = UltimateBoard(points, verbose=False)
+
+    while True:
+        symbol = board.current_symbol
+        board.new_move(engine.decide(strategies[symbol], board, symbol), symbol)
+
+        if board.total_moves == 0:
+            return board.last_result